@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Setup and output shared by the benchmarks.
+
+Imported before openwinch : benchmarks run from the repository root, on the
+emulated board, without display nor debug log file unless the environment
+sets them.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault('OW_BOARD', 'openwinch.hardware.Emulator')
+os.environ.setdefault('OW_LOG_FILE', '')
+os.environ.setdefault('OW_GUI', 'DISABLE')
+
+
+def argumentParser(doc) -> argparse.ArgumentParser:
+    """ Parser described by the first line of a docstring, with `--output`. """
+    parser = argparse.ArgumentParser(description=doc.splitlines()[0])
+    parser.add_argument('--output', help="JSON file (default is stdout)")
+    return parser
+
+
+def writeResult(result, output=None, sort_keys=False):
+    """ Write a result as JSON to a file, or to stdout without file. """
+    text = json.dumps(result, indent=2, sort_keys=sort_keys)
+    if (output is None):
+        print(text)
+    else:
+        with open(output, 'w') as file:
+            file.write(text + "\n")
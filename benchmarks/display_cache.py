@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Frame render time of each screen with and without the font and sprite caches.
+
+Without cache, the registries are cleared before each frame : every font and
+static text used by the frame is loaded and rasterized again.
+
+Usage : python benchmarks/display_cache.py [--frames 200] [--output result.json]
+"""
+
+import time
+
+# Path, working directory and environment, before openwinch.
+from _common import (argumentParser, writeResult)
+
+from openwinch.controller import Winch
+from openwinch.display import (Gui, MainScreen, MenuScreen, ModeSelectorScreen, SecurityDistanceScreen)
+from openwinch.metrics import Histogram
+
+SCREENS = [MainScreen, MenuScreen, ModeSelectorScreen, SecurityDistanceScreen]
+
+
+def render(gui, frames, cached):
+    histogram = Histogram(resolution=0.00001, size=10000)
+    for _ in range(frames):
+        if (not cached):
+            gui.getFonts().clear()
+            gui.getSprites().clear()
+
+        begin = time.perf_counter()
+        gui.render()
+        histogram.record(time.perf_counter() - begin)
+
+    return histogram.toDict()
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--frames', type=int, default=200)
+    args = parser.parse_args()
+
+    winch = Winch(threaded=False)
+
+    begin = time.perf_counter()
+    gui = Gui(winch)
+    warm = time.perf_counter() - begin
+
+    result = {"frames": args.frames, "gui_init": warm, "fonts": len(gui.getFonts()), "screens": {}}
+    for screen in SCREENS:
+        gui.screen = screen(gui)
+        result["screens"][screen.__name__] = {
+            "uncached": render(gui, args.frames, False),
+            "cached": render(gui, args.frames, True),
+        }
+
+    writeResult(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Frame build time of the PIL and packed (NumPy) compositing backends.
+
+A frame is built when it is ready for the SH1106 : drawn, then converted to
+pages (the PIL frame is converted with `framebuffer.toPages()`, the packed
+frame is already in that layout).
+
+Usage : python benchmarks/display_packed.py [--frames 500] [--output result.json]
+"""
+
+import time
+
+# Path, working directory and environment, before openwinch.
+from _common import (argumentParser, writeResult)
+
+from PIL import Image
+
+from openwinch.display import (Gui, MainScreen, MenuScreen, ModeSelectorScreen, SecurityDistanceScreen)
+from openwinch.framebuffer import toPages
+from openwinch.metrics import Histogram
+from openwinch.simulation import Simulation
+
+SCREENS = [MainScreen, MenuScreen, ModeSelectorScreen, SecurityDistanceScreen]
+BACKENDS = ['PIL', 'PACKED']
+
+
+def build(gui, frames):
+    histogram = Histogram(resolution=0.000001, size=10000)
+    for _ in range(frames):
+        begin = time.perf_counter()
+        frame = gui.render()
+        if (isinstance(frame, Image.Image)):
+            toPages(frame)
+        else:
+            frame.toPages()
+        histogram.record(time.perf_counter() - begin)
+
+    return histogram.toDict()
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--frames', type=int, default=500)
+    args = parser.parse_args()
+
+    # Running winch : MainScreen animates the distance bar.
+    simulation = Simulation()
+    simulation.winch.initialize()
+    simulation.runUntil(lambda winch: winch.getState().isStop)
+    simulation.winch.start()
+    simulation.step(10)
+
+    result = {"frames": args.frames, "screens": {}}
+    for screen in SCREENS:
+        result["screens"][screen.__name__] = {}
+        for backend in BACKENDS:
+            gui = Gui(simulation.winch, backend)
+            gui.screen = screen(gui)
+            build(gui, 20)
+            result["screens"][screen.__name__][backend] = build(gui, args.frames)
+
+    writeResult(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Display cost of every screen on the luma in-memory dummy device.
+
+Each screen is displayed by `Gui.display()` : frames per second, draw and
+transfer time per frame (`Gui.getFrameStats()`), and memory allocated per
+frame (tracemalloc peak above the memory in use before the frame, and memory
+still in use after). `MainScreen` is measured in each winch state.
+
+Usage : python benchmarks/display_screens.py [--frames 200] [--backend PIL] [--output result.json]
+"""
+
+import os
+import platform
+import time
+import tracemalloc
+
+# Path, working directory and environment, before openwinch.
+from _common import (argumentParser, writeResult)
+
+# Frames go to the luma in-memory device.
+os.environ['OW_GUI'] = 'DUMMY'
+
+from openwinch.display import (Gui,  # noqa
+                               MainScreen,
+                               MenuScreen,
+                               ManualPositionScreen,
+                               SecurityDistanceScreen,
+                               ModeSelectorScreen,
+                               VelocityStartScreen,
+                               VelocityStopScreen)
+from openwinch.gallery import StaticWinch  # noqa
+from openwinch.state import State  # noqa
+from openwinch.version import __version__  # noqa
+
+
+SCREENS = [MenuScreen, ManualPositionScreen, SecurityDistanceScreen, ModeSelectorScreen, VelocityStartScreen, VelocityStopScreen]
+
+
+def cases() -> list:
+    """ (name, state, screen) of every screen, `MainScreen` in each state. """
+    result = [("MainScreen.%s" % state.name, state, MainScreen) for state in State if state.isBoot]
+    result += [(screen.__name__, State.IDLE, screen) for screen in SCREENS]
+    return result
+
+
+def measure(gui, frames) -> dict:
+    for _ in range(20):
+        gui.display()
+    gui.resetFrameStats()
+
+    begin = time.perf_counter()
+    for _ in range(frames):
+        gui.display()
+    elapsed = time.perf_counter() - begin
+    stats = gui.getFrameStats()
+
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    peaks = []
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        gui.display()
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    retained = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+
+    return {
+        "fps": frames / elapsed,
+        "draw": stats["render"],
+        "transfer": stats["transfer"],
+        "alloc_peak_mean": sum(peaks) / len(peaks),
+        "alloc_peak_max": max(peaks),
+        "alloc_retained": retained / frames,
+    }
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--backend', default='PIL', choices=['PIL', 'PACKED'])
+    args = parser.parse_args()
+
+    result = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "frames": args.frames,
+        "screens": {},
+    }
+    for name, state, screen in cases():
+        gui = Gui(StaticWinch(state), args.backend)
+        gui.screen = screen(gui)
+        result["screens"][name] = measure(gui, args.frames)
+
+    writeResult(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Worst-case emergency latency while the web and display threads are busy.
+
+Usage : python benchmarks/emergency_latency.py [--runs 200] [--web 4] [--output result.json]
+"""
+
+import random
+import threading
+import time
+
+# Path, working directory and environment, before openwinch.
+from _common import (argumentParser, writeResult)
+
+from openwinch.app import create_app
+from openwinch.display import Gui
+from openwinch.metrics import Histogram
+from openwinch.singleton import winch
+
+
+def web_load(app, stop, counter):
+    client = app.test_client()
+    while not stop.is_set():
+        client.get(random.choice(["/", "/up", "/down", "/extra"]))
+        counter[0] += 1
+
+
+def display_load(gui, stop, counter):
+    while not stop.is_set():
+        try:
+            gui.render()
+            counter[0] += 1
+        except Exception:
+            # Keep the load even when a frame fails (ex: no battery on host).
+            counter[1] += 1
+
+
+def wait_state(check, timeout=2):
+    limit = time.monotonic() + timeout
+    while not check(winch.getState()) and time.monotonic() < limit:
+        time.sleep(0.001)
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--web', type=int, default=4, help="web client threads")
+    parser.add_argument('--display', type=int, default=1, help="display threads")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    app = create_app(winch)
+    gui = Gui(winch)
+
+    stop = threading.Event()
+    web_counter = [0]
+    display_counter = [0, 0]
+    threads = [threading.Thread(target=web_load, args=(app, stop, web_counter), daemon=True) for _ in range(args.web)]
+    threads += [threading.Thread(target=display_load, args=(gui, stop, display_counter), daemon=True) for _ in range(args.display)]
+    for thread in threads:
+        thread.start()
+
+    # Latency seen by the caller of Winch.emergency().
+    caller = Histogram(resolution=0.00001, size=10000)
+    begin = time.monotonic()
+    for _ in range(args.runs):
+        winch.initialize()
+        wait_state(lambda state: state.isStop)
+        winch.start()
+        time.sleep(random.uniform(0, 0.02))
+
+        start = time.monotonic()
+        winch.emergency()
+        caller.record(time.monotonic() - start)
+        wait_state(lambda state: state.isFault)
+    duration = time.monotonic() - begin
+
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    result = {
+        "runs": args.runs,
+        "web_threads": args.web,
+        "display_threads": args.display,
+        "web_requests_per_s": web_counter[0] / duration,
+        "display_frames_per_s": display_counter[0] / duration,
+        "display_errors": display_counter[1],
+        "emergency_call": caller.toDict(),
+        "board_cut": winch.getLatencyStats().get("ERROR"),
+        "loop": {key: value for key, value in winch.getLoopStats().items() if key != "histogram"},
+    }
+    writeResult(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Web request latency and the control loop jitter it causes.
+
+A winch runs its control loop thread (emulated board, no display). The loop
+statistics are recorded first without load, then while client threads send
+their requests. The jitter is the lateness of the scheduled ticks; ticks woken
+up by commands (`/start`, `/stop`) are reported apart (`wakeup`). A warning is
+printed when too few scheduled ticks were measured for a p99. Transports :
+- `client` transport : Flask test client, no socket.
+- `socket` transport : HTTP on a local port, served by the Flask (werkzeug)
+  or the asyncio server (`--server`), in the same process as the winch.
+
+Each client sends the same number of requests, paths drawn from a generator
+seeded by `--seed` and the client index : a run sends the same requests in
+the same order per client, to compare commits.
+
+Usage : python benchmarks/web_load.py [--transport client] [--concurrency 4] [--requests 500] [--output result.json]
+"""
+
+import asyncio
+import http.client
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+
+# Path, working directory and environment, before openwinch.
+from _common import (ROOT, argumentParser, writeResult)
+
+from openwinch.app import create_app
+from openwinch.controller import Winch
+from openwinch.metrics import Histogram
+from openwinch.server import WebServer
+from openwinch.version import __version__
+
+PATHS = ["/", "/up", "/down", "/start", "/stop"]
+
+# Scheduled ticks needed by a p99 of the loop statistics.
+MIN_SAMPLES = 100
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return None
+
+
+def sequence(seed, index, requests, paths) -> list:
+    generator = random.Random("%s-%d" % (seed, index))
+    return [generator.choice(paths) for _ in range(requests)]
+
+
+class TestClient(object):
+    """ Requests through the Flask test client. """
+
+    def __init__(self, app):
+        self.__client = app.test_client()
+
+    def get(self, path) -> int:
+        return self.__client.get(path).status_code
+
+    def close(self):
+        pass
+
+
+class SocketClient(object):
+    """ Requests on a keep-alive HTTP connection. """
+
+    def __init__(self, port):
+        self.__connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+
+    def get(self, path) -> int:
+        self.__connection.request("GET", path)
+        response = self.__connection.getresponse()
+        response.read()
+        if (response.will_close):
+            self.__connection.close()
+        return response.status
+
+    def close(self):
+        self.__connection.close()
+
+
+def startServer(name, winch) -> int:
+    """ Serve a winch on a free local port from a daemon thread. """
+    if (name == 'FLASK'):
+        from werkzeug.serving import make_server
+
+        server = make_server("127.0.0.1", 0, create_app(winch), threaded=True)
+        threading.Thread(target=server.serve_forever, name="web", daemon=True).start()
+        return server.server_port
+
+    server = WebServer(winch)
+    loop = asyncio.new_event_loop()
+    started = asyncio.run_coroutine_threadsafe(server.start("127.0.0.1", 0), loop)
+    threading.Thread(target=loop.run_forever, name="web", daemon=True).start()
+    started.result(10)
+    return server.getPort()
+
+
+def newHistogram() -> Histogram:
+    return Histogram(resolution=0.0001, size=10000)
+
+
+def run(factory, paths, result):
+    """ Send requests, result gets the latency histogram per path and the errors. """
+    latency = {}
+    errors = 0
+    client = factory()
+    try:
+        for path in paths:
+            begin = time.perf_counter()
+            try:
+                status = client.get(path)
+            except (OSError, http.client.HTTPException):
+                status = None
+            latency.setdefault(path, newHistogram()).record(time.perf_counter() - begin)
+            if (status != 200):
+                errors += 1
+    finally:
+        client.close()
+    result.append((latency, errors))
+
+
+def loopStats(winch, name, warnings) -> dict:
+    """ Get loop statistics, warn when too few scheduled ticks support the percentiles. """
+    stats = winch.getLoopStats()
+    # JSON keys are strings : bucket start in microseconds.
+    stats["histogram"] = {"%d" % round(bucket * 1e6): count for bucket, count in stats["histogram"].items()}
+
+    samples = stats["lateness"]["count"]
+    if (samples < MIN_SAMPLES):
+        warning = "%s : %d scheduled ticks, p99 needs at least %d" % (name, samples, MIN_SAMPLES)
+        print("warning : %s" % warning, file=sys.stderr)
+        warnings.append(warning)
+    return stats
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--transport', default='client', choices=['client', 'socket'])
+    parser.add_argument('--server', default='FLASK', choices=['FLASK', 'ASYNCIO'], help="server of the socket transport")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=500, help="requests per client")
+    parser.add_argument('--paths', default=",".join(PATHS))
+    parser.add_argument('--baseline', type=float, default=2, help="seconds of loop without load")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    paths = args.paths.split(",")
+
+    winch = Winch()
+    winch.initialize()
+    limit = time.monotonic() + 5
+    while not winch.getState().isStop and time.monotonic() < limit:
+        time.sleep(0.01)
+
+    if (args.transport == 'client'):
+        app = create_app(winch)
+
+        def factory():
+            return TestClient(app)
+    else:
+        port = startServer(args.server, winch)
+
+        def factory():
+            return SocketClient(port)
+
+    # Loop without load.
+    warnings = []
+    winch.resetLoopStats()
+    time.sleep(args.baseline)
+    idle = loopStats(winch, "loop_idle", warnings)
+
+    results = []
+    threads = [threading.Thread(target=run, args=(factory, sequence(args.seed, index, args.requests, paths), results))
+               for index in range(args.concurrency)]
+
+    winch.resetLoopStats()
+    begin = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.perf_counter() - begin
+    loaded = loopStats(winch, "loop_loaded", warnings)
+
+    total = newHistogram()
+    latency = {path: newHistogram() for path in paths}
+    for client_latency, _ in results:
+        for path, histogram in client_latency.items():
+            latency[path].merge(histogram)
+            total.merge(histogram)
+
+    result = {
+        "version": __version__,
+        "commit": commit(),
+        "python": platform.python_version(),
+        "transport": args.transport,
+        "server": args.server if args.transport == 'socket' else None,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "seed": args.seed,
+        "duration": duration,
+        "requests_per_second": args.concurrency * args.requests / duration,
+        "errors": sum(errors for _, errors in results),
+        "latency": total.toDict(),
+        "latency_paths": {path: latency[path].toDict() for path in paths},
+        "loop_idle": idle,
+        "loop_loaded": loaded,
+        "warnings": warnings,
+    }
+
+    writeResult(result, args.output, sort_keys=True)
+
+    winch.emergency()
+
+
+if __name__ == "__main__":
+    main()
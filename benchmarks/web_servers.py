@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Memory and requests per second of the Flask and asyncio web servers.
+
+Each server is started as `python -m openwinch` (emulated board, no display)
+with `OW_WEB`, then loaded by client threads on keep-alive connections.
+Memory is read from /proc (Linux) : resident size once idle, after the load,
+and its peak. Threads of the server are sampled during the load.
+
+Usage : python benchmarks/web_servers.py [--clients 8] [--duration 5] [--output result.json]
+"""
+
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+# Path, working directory and environment of the servers.
+from _common import (ROOT, argumentParser, writeResult)
+
+SERVERS = ['FLASK', 'ASYNCIO']
+PATHS = ['/api/v1/state', '/']
+
+
+def status(pid) -> dict:
+    """ Get memory (kB) and threads of a process from /proc. """
+    result = {}
+    with open("/proc/%d/status" % pid) as file:
+        for line in file:
+            name, value = line.split(":", 1)
+            if (name in ("VmRSS", "VmHWM", "Threads")):
+                result[name] = int(value.split()[0])
+    return result
+
+
+def waitPort(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Server not listening on %d" % port)
+
+
+def load(port, path, clients, duration) -> dict:
+    counts = [0] * clients
+    errors = [0] * clients
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        while time.monotonic() < deadline:
+            try:
+                connection.request("GET", path)
+                response = connection.getresponse()
+                response.read()
+                if (response.will_close):
+                    connection.close()
+                counts[index] += 1
+            except (OSError, http.client.HTTPException):
+                errors[index] += 1
+                connection.close()
+        connection.close()
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return {"requests_per_second": sum(counts) / duration, "errors": sum(errors)}
+
+
+def bench(server, port, clients, duration) -> dict:
+    env = dict(os.environ, OW_WEB=server, OW_WEB_PORT=str(port))
+    process = subprocess.Popen([sys.executable, "-m", "openwinch"], cwd=ROOT, env=env,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        waitPort(port)
+        time.sleep(1)
+        idle = status(process.pid)
+
+        result = {"rss_idle_kb": idle["VmRSS"], "threads_idle": idle["Threads"], "paths": {}}
+        threads = [idle["Threads"]]
+        loading = threading.Event()
+
+        def sample():
+            while not loading.wait(0.1):
+                threads.append(status(process.pid)["Threads"])
+
+        sampler = threading.Thread(target=sample)
+        sampler.start()
+        for path in PATHS:
+            result["paths"][path] = load(port, path, clients, duration)
+        loading.set()
+        sampler.join()
+
+        loaded = status(process.pid)
+        result["threads_max"] = max(threads)
+        result["rss_loaded_kb"] = loaded["VmRSS"]
+        result["rss_peak_kb"] = loaded["VmHWM"]
+        return result
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argumentParser(__doc__)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--port', type=int, default=5080)
+    args = parser.parse_args()
+
+    result = {"clients": args.clients, "duration": args.duration, "servers": {}}
+    for server in SERVERS:
+        result["servers"][server] = bench(server, args.port, args.clients, args.duration)
+
+    writeResult(result, args.output)
+
+
+if __name__ == "__main__":
+    main()
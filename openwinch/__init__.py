@@ -9,13 +9,34 @@ from openwinch.constantes import *  # noqa
 from openwinch.controller import Winch
 from openwinch.logger import logger
 from openwinch.mode import (ModeFactory, ModeType, ModeEngine, OneWayMode, TwoWayMode, InfinityMode)
-from openwinch.singleton import (winch)
 from openwinch.state import State
 from openwinch.version import __version__
 
-# Web Component
-from openwinch.web_extra import *  # noqa
-from openwinch.web_main import *  # noqa
+import importlib
+
+# Loaded on first access : the singleton builds the Winch (hardware, threads)
+# and the web components import Flask. The blueprints are not exported under
+# the name of their module : once imported, `openwinch.web_main` is the module.
+__lazy = {
+    'winch': ('openwinch.singleton', 'winch'),
+    'create_app': ('openwinch.app', 'create_app'),
+    'web_main_blueprint': ('openwinch.web_main', 'web_main'),
+    'web_extra_blueprint': ('openwinch.web_extra', 'web_extra'),
+    'web_api_blueprint': ('openwinch.web_api', 'web_api'),
+}
+
+# Web submodules, always the module whatever the import order.
+__submodules = ['web_main', 'web_extra', 'web_api']
+
+
+def __getattr__(name):
+    if (name in __lazy):
+        module, attribute = __lazy[name]
+        return getattr(importlib.import_module(module), attribute)
+    elif (name in __submodules):
+        return importlib.import_module("%s.%s" % (__name__, name))
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 __all__ = ['config',
            'Winch',
@@ -28,4 +49,5 @@ __all__ = ['config',
            'TwoWayMode',
            'InfinityMode',
            'winch',
+           'create_app',
            '__version__', ]
@@ -4,13 +4,17 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
-from flask import Flask
-from openwinch.web_extra import web_extra
-from openwinch.web_main import web_main
+from openwinch.config import config
 
-app = Flask(__name__)
-app.register_blueprint(web_extra)
-app.register_blueprint(web_main)
+if (config.WEB == 'ASYNCIO'):
+    from openwinch.server import serve
 
-if __name__ == "__main__":
-    app.run(host='0.0.0.0')
+    if __name__ == "__main__":
+        serve(host='0.0.0.0', port=config.WEB_PORT)
+else:
+    from openwinch.app import create_app
+
+    app = create_app()
+
+    if __name__ == "__main__":
+        app.run(host='0.0.0.0', port=config.WEB_PORT)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from flask import (Flask, current_app, make_response, render_template, request)
+from openwinch.config import config
+
+
+def create_app(winch=None) -> Flask:
+    """ Create the web application.
+
+    Parameters
+    ----------
+    winch : Winch, optional
+        Winch driven by the application (default is the `openwinch.winch`
+        singleton, created on first use)
+
+    Returns
+    -------
+    Flask
+        Application with all web blueprints registered.
+    """
+    from openwinch.pages import PageCache
+    from openwinch.telemetry import Broadcaster
+    from openwinch.web_api import web_api
+    from openwinch.web_extra import web_extra
+    from openwinch.web_main import web_main
+
+    if (winch is None):
+        from openwinch.singleton import winch
+
+    app = Flask('openwinch')
+    app.extensions['openwinch'] = winch
+    app.extensions['openwinch.stream'] = Broadcaster(winch, config.STREAM_RATE)
+    app.extensions['openwinch.pages'] = PageCache(winch)
+    app.register_blueprint(web_extra)
+    app.register_blueprint(web_main)
+    app.register_blueprint(web_api)
+
+    return app
+
+
+def current_winch():
+    """ Get the winch of the current application. """
+    return current_app.extensions['openwinch']
+
+
+def current_broadcaster():
+    """ Get the state stream of the current application. """
+    return current_app.extensions['openwinch.stream']
+
+
+def current_pages():
+    """ Get the page cache of the current application. """
+    return current_app.extensions['openwinch.pages']
+
+
+def render_page(template, context):
+    """ Render a template from the page cache, gzipped when accepted.
+
+    Parameters
+    ----------
+    template : str
+        Template name, also the cached view.
+    context : callable
+        Template values of a winch, like `pages.mainContext`.
+    """
+    winch = current_winch()
+    page = current_pages().get(template, lambda: render_template(template, **context(winch)))
+
+    if (request.accept_encodings.quality('gzip') > 0):
+        response = make_response(page.gzip)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = make_response(page.body)
+    response.headers['Content-Type'] = 'text/html; charset=utf-8'
+    response.vary.add('Accept-Encoding')
+    return response
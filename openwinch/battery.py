@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.logger import logger
+
+from abc import ABC, abstractmethod
+
+import os
+import threading
+import time
+
+BATTERY_PATH = "/sys/class/power_supply/BAT0"
+
+
+class BatterySource(ABC):
+
+    @abstractmethod
+    def read(self) -> int:
+        """ Read battery level in percent. """
+        pass
+
+    def close(self):
+        pass
+
+
+class SysfsBattery(BatterySource):
+    """ Battery level from a sysfs power supply.
+
+    Files stay open, each read seeks back to the start.
+    """
+
+    def __init__(self, path=BATTERY_PATH):
+        prefix = "energy" if os.path.exists(os.path.join(path, "energy_now")) else "charge"
+        self.__now = open(os.path.join(path, "%s_now" % prefix), "r")
+        self.__full = open(os.path.join(path, "%s_full" % prefix), "r")
+
+    def __readFile(self, file) -> float:
+        file.seek(0)
+        return float(file.readline())
+
+    def read(self) -> int:
+        return int(self.__readFile(self.__now) / self.__readFile(self.__full) * 100)
+
+    def close(self):
+        self.__now.close()
+        self.__full.close()
+
+
+class SyntheticBattery(BatterySource):
+    """ Battery discharging linearly with time.
+
+    Parameters
+    ----------
+    clock : callable, optional
+        Monotonic clock in seconds (default is time.monotonic)
+    discharge : float, optional
+        Discharge rate in percent per hour (default is 25)
+    """
+
+    def __init__(self, clock=time.monotonic, discharge=25):
+        self.__clock = clock
+        self.__begin = clock()
+        self.__discharge = discharge / 3600
+
+    def read(self) -> int:
+        return max(0, int(100 - (self.__clock() - self.__begin) * self.__discharge))
+
+
+def openBattery(path=BATTERY_PATH, clock=time.monotonic) -> BatterySource:
+    """ Open the system battery, or a synthetic one when missing. """
+    try:
+        return SysfsBattery(path)
+    except (OSError, ValueError):
+        logger.info("No battery on %s, use synthetic battery." % path)
+        return SyntheticBattery(clock)
+
+
+class BatterySampler(object):
+    """ Cache of the battery level refreshed at low rate.
+
+    With `start()`, a background thread samples the source. Without it, the
+    source is sampled on read when the cached value is older than the period.
+
+    Parameters
+    ----------
+    source : BatterySource
+        Battery to sample.
+    period : float, optional
+        Sampling period in seconds (default is 5)
+    clock : callable, optional
+        Monotonic clock in seconds (default is time.monotonic)
+    """
+
+    def __init__(self, source, period=5, clock=time.monotonic):
+        self.__source = source
+        self.__period = period
+        self.__clock = clock
+        self.__thread = None
+        self.__stop = threading.Event()
+        self.__sample = (0, None)
+
+    def sample(self):
+        """ Read the source now. """
+        try:
+            value = self.__source.read()
+        except (OSError, ValueError) as ex:
+            logger.error("Battery read fail : %s" % ex)
+            return
+
+        self.__sample = (value, self.__clock())
+
+    def __run(self):
+        while (not self.__stop.wait(self.__period)):
+            self.sample()
+
+    def start(self):
+        """ Sample in a background thread. """
+        if (self.__thread is None):
+            self.sample()
+            self.__thread = threading.Thread(target=self.__run, name="Battery", args=(), daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """ Stop the background thread and close the source. """
+        self.__stop.set()
+        if (self.__thread is not None):
+            self.__thread.join()
+            self.__thread = None
+        self.__source.close()
+
+    def getSample(self) -> tuple:
+        """ Get the last sample as (percent, timestamp). """
+        if (self.__thread is None):
+            timestamp = self.__sample[1]
+            if (timestamp is None or self.__clock() - timestamp >= self.__period):
+                self.sample()
+
+        return self.__sample
+
+    def getValue(self) -> int:
+        """ Get the last sampled level in percent. """
+        return self.getSample()[0]
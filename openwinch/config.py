@@ -4,6 +4,8 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
+from openwinch.constantes import LOOP_DELAY
+
 from os import environ
 
 
@@ -11,6 +13,15 @@ class Config(object):
     BOARD = environ.get('OW_BOARD', 'openwinch.hardwarePi.RaspberryPi')
     MODE = environ.get('OW_MODE', 'ModeType.OneWay')
     GUI = environ.get('OW_GUI', 'SH1106_I2C')
+    GUI_BACKEND = environ.get('OW_GUI_BACKEND', 'PIL')
+    LOOP_RATE = float(environ.get('OW_LOOP_RATE', 1 / LOOP_DELAY))
+    LOOP_POLICY = environ.get('OW_LOOP_POLICY', 'CATCH_UP')
+    BOARD_PIPELINE = environ.get('OW_BOARD_PIPELINE', 'DISABLE')
+    BATTERY_PERIOD = float(environ.get('OW_BATTERY_PERIOD', 5))
+    STREAM_RATE = float(environ.get('OW_STREAM_RATE', 5))
+    WEB = environ.get('OW_WEB', 'FLASK')
+    WEB_PORT = int(environ.get('OW_WEB_PORT', 5000))
+    LOG_FILE = environ.get('OW_LOG_FILE', 'openwinch.log')
 
 
 config = Config()
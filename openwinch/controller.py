@@ -7,16 +7,16 @@
 
 from openwinch.config import config
 from openwinch.constantes import (SPEED_INIT, SPEED_MAX, SPEED_MIN)
-from openwinch.display import Gui
-from openwinch.keyboard import Keyboard
 from openwinch.logger import logger
 from openwinch.mode import ModeFactory, ModeType
+from openwinch.pipeline import BoardPipeline
 from openwinch.state import State
 from openwinch.utils import loadClass
 from openwinch.version import __version__
 
 import atexit
 import threading
+import time
 
 
 class Winch(object):
@@ -27,18 +27,40 @@ class Winch(object):
     __gui = None
     __input = None
     __mode = None
+    __pipeline = None
 
     __state = State.UNKNOWN
     __speed_target = SPEED_INIT
+    __version = 0
 
-    def __init__(self):
-        """ Constructor of Winch class. """
+    def __init__(self, board=None, mode=None, clock=None, threaded=True):
+        """ Constructor of Winch class.
 
-        # Always pass in emergency mode when Application halt/exit !!!
-        atexit.register(self.emergency)
-        threading.currentThread().setName("Main")
+        Parameters
+        ----------
+        board : str, optional
+            Board class (default is config.BOARD)
+        mode : str, optional
+            Mode of winch (default is config.MODE)
+        clock : callable, optional
+            Monotonic clock in seconds (default is time.monotonic)
+        threaded : bool, optional
+            Start GUI, keyboard and control loop threads (default is True).
+            Without threads, the control loop is driven by `controlTick()`.
+        """
+
+        self.__board_name = board if board is not None else config.BOARD
+        self.__mode_name = mode if mode is not None else config.MODE
+        self.__clock = clock if clock is not None else time.monotonic
+        self.__threaded = threaded
+
+        if (threaded):
+            # Always pass in emergency mode when Application halt/exit !!!
+            atexit.register(self.emergency)
+            threading.current_thread().name = "Main"
+
+            self.__banner()
 
-        self.__banner()
         self.__loadConfig()
         self.__initControlLoop()
 
@@ -58,27 +80,51 @@ class Winch(object):
     /_/                                            Ver. %s""" % __version__) # noqa
 
     def __loadConfig(self):
-        logger.debug("Gui config : %s" % config.GUI)
-        self.__gui = Gui(self)
-        self.__gui.boot()
-        self._input = Keyboard(self, self.__gui)
-
-        logger.debug("Board config : %s" % config.BOARD)
-        self.__board = loadClass(config.BOARD, self)
+        if (self.__threaded):
+            # Display and keyboard load luma, PIL and click : import them only when used.
+            from openwinch.display import Gui
+            from openwinch.keyboard import Keyboard
+
+            logger.debug("Gui config : %s" % config.GUI)
+            self.__gui = Gui(self)
+            self.__gui.boot()
+            atexit.register(self.__gui.stop)
+            self._input = Keyboard(self, self.__gui)
+
+        logger.debug("Board config : %s" % self.__board_name)
+        self.__board = loadClass(self.__board_name, self)
         logger.info("Board : %s" % type(self.__board).__name__)
 
-        logger.debug("Mode config : %s" % config.MODE)
-        self.__mode = ModeFactory.modeFactory(self, self.__board, config.MODE)
+        if (self.__threaded and config.BOARD_PIPELINE == 'ENABLE'):
+            logger.debug("Board outputs on I/O thread.")
+            self.__pipeline = BoardPipeline(self.__board, clock=self.__clock)
+            self.__board = self.__pipeline
+
+        logger.debug("Mode config : %s" % self.__mode_name)
+        self.__mode = ModeFactory.modeFactory(self, self.__board, self.__mode_name)
         logger.info("Mode : %s" % self.getMode())
 
     def __initControlLoop(self):
         """ Initialize Control Loop thread. """
 
-        logger.debug("Initialize Control Loop...")
-        self.__controlLoop = threading.Thread(target=self.__mode.runControlLoop, name="Ctrl", args=(), daemon=True)
-        self.__controlLoop.start()
+        if (self.__threaded):
+            logger.debug("Initialize Control Loop...")
+            self.__controlLoop = threading.Thread(target=self.__mode.runControlLoop, name="Ctrl", args=(), daemon=True)
+            if (self.__pipeline is not None):
+                self.__pipeline.start()
+            self.__controlLoop.start()
+            self.__board.startSampling()
         self.__changeState(State.BOOTED)
 
+    def controlTick(self):
+        """ Run one iteration of the control loop on the calling thread.
+
+        Only for winch created without threads (simulation).
+        """
+        if (self.__threaded):
+            raise RuntimeError('Control loop is already driven by its thread')
+        self.__mode.tick()
+
     def initialize(self):
         """ Initialise Hardware.
 
@@ -139,6 +185,10 @@ class Winch(object):
     def emergency(self):
         """ Command Emergency winch. """
 
+        # Cut power before anything else (logging included).
+        if (self.__mode is not None):
+            self.__mode.emergency()
+
         logger.fatal("HALT EMERGENCY")
         self.__changeState(State.ERROR)
 
@@ -160,11 +210,23 @@ class Winch(object):
         if (self.__state != state):
             logger.debug("Switch state : %s", state)
             self.__state = state
+            self.__version += 1
+
+            if (self.__mode is not None):
+                self.__mode.notify(state)
 
     def getMode(self) -> ModeType:
         """ """
         return ModeFactory.getMode(self.__mode)
 
+    def getClock(self):
+        """ Get the monotonic clock used by the winch. """
+        return self.__clock
+
+    def getSpeedCurrent(self):
+        """ Get current speed of winch. """
+        return self.__mode.getSpeedCurrent()
+
     def getSpeedTarget(self):
         """ Get Target speed of winch."""
         return self.__speed_target
@@ -173,16 +235,42 @@ class Winch(object):
         """ Get actual state of winch. """
         return self.__state
 
+    def getVersion(self) -> int:
+        """ Get a counter changed by every state and speed target change. """
+        return self.__version
+
     def getBattery(self):
         """ Get actual state of Battery. """
         return self.__board.getBattery()
 
+    def getBatterySample(self) -> tuple:
+        """ Get actual state of Battery as (percent, timestamp). """
+        return self.__board.getBatterySample()
+
     def getRemote(self):
         return 15
 
     def getDistance(self):
         return self.__mode.getDistance()
 
+    def getLoopStats(self) -> dict:
+        """ Get timing statistics of the control loop. """
+        return self.__mode.getLoopStats()
+
+    def resetLoopStats(self):
+        """ Clear timing statistics of the control loop. """
+        self.__mode.resetLoopStats()
+
+    def getLatencyStats(self) -> dict:
+        """ Get command-to-actuation latency per state. """
+        return self.__mode.getLatencyStats()
+
+    def getPipelineStats(self) -> dict:
+        """ Get board output pipeline statistics (empty when disabled). """
+        if (self.__pipeline is None):
+            return {}
+        return self.__pipeline.getPipelineStats()
+
     def speedUp(self, value=1):
         """ Up speed.
 
@@ -193,6 +281,7 @@ class Winch(object):
         """
         if (self.__speed_target < SPEED_MAX):
             self.__speed_target += value
+            self.__version += 1
 
     def speedDown(self, value=1):
         """ Down speed.
@@ -204,8 +293,24 @@ class Winch(object):
         """
         if (self.__speed_target > SPEED_MIN):
             self.__speed_target -= value
+            self.__version += 1
+
+    def speedValue(self, value) -> bool:
+        """ Set speed.
+
+        Parameters
+        ----------
+        value : int
+            Speed target, from SPEED_MIN to SPEED_MAX.
 
-    def speedValue(self, value):
-        """ Set speed. """
-        if (value >= SPEED_MIN or value < SPEED_MAX):
-            self.__speed_target = value
+        Returns
+        -------
+        bool
+            False when the value is out of range (speed unchanged).
+        """
+        if (SPEED_MIN <= value <= SPEED_MAX):
+            if (self.__speed_target != value):
+                self.__speed_target = value
+                self.__version += 1
+            return True
+        return False
@@ -4,20 +4,22 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
-from luma.core.render import canvas
-from luma.core.sprite_system import framerate_regulator
-from PIL import ImageFont
+from PIL import (Image, ImageChops, ImageDraw, ImageFont)
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from enum import Enum, unique
 
+import math
 import sys
 import threading
+import time
 
 from openwinch.config import config
 from openwinch.constantes import SPEED_UNIT, WINCH_DISTANCE
 from openwinch.input import InputType
 from openwinch.logger import logger
+from openwinch.metrics import Histogram
 from openwinch.display_config import (ITEM_BACK,
                                       COLOR_PRIM_FONT,
                                       COLOR_PRIM_BACK,
@@ -25,8 +27,10 @@ from openwinch.display_config import (ITEM_BACK,
                                       COLOR_SELC_BACK,
                                       FONT_TEXT,
                                       FONT_ICON,
-                                      FONT_LOGO)
-from openwinch.hardware_config import (LCD_HEIGHT, LCD_WIDTH, LCD_ADDR, LCD_FPS)
+                                      FONT_LOGO,
+                                      FONT_PRELOAD,
+                                      SPRITE_CACHE_SIZE)
+from openwinch.hardware_config import (LCD_HEIGHT, LCD_WIDTH, LCD_ADDR, LCD_FPS, LCD_IDLE_FPS, LCD_INPUT_BOOST)
 from openwinch.version import __version__
 
 
@@ -36,6 +40,108 @@ class GuiType(Enum):
     SH1106_I2C = 1
     VGA = 100
     CAPTURE = 101
+    DUMMY = 102
+
+
+class FontRegistry(object):
+    """ Cache of TrueType fonts by (face, size).
+
+    Each font file is parsed once, later lookups are a dict access.
+    """
+
+    def __init__(self):
+        self.__fonts = {}
+
+    def get(self, face, size) -> ImageFont.FreeTypeFont:
+        """ Get a font, loading it on first use. """
+        font = self.__fonts.get((face, size))
+        if (font is None):
+            font = ImageFont.truetype(face, size)
+            self.__fonts[(face, size)] = font
+        return font
+
+    def warm(self, fonts):
+        """ Load a list of (face, size). """
+        for face, size in fonts:
+            self.get(face, size)
+
+    def clear(self):
+        self.__fonts.clear()
+
+    def __len__(self):
+        return len(self.__fonts)
+
+
+class SpriteCache(object):
+    """ Cache of static texts and icons rasterized to 1-bit tiles.
+
+    A tile is cropped to the ink of the text and has a normal (white on
+    black) and an inverted (black on white) variant. Pasted on a frame at the
+    position given to `ImageDraw.text()`, it gives the same pixels when the
+    background under the ink box is plain.
+
+    Dynamic texts (speed, distance...) get a tile per value, so the least
+    recently used tiles are dropped beyond `size` entries.
+
+    Parameters
+    ----------
+    fonts : FontRegistry
+        Fonts to rasterize with.
+    size : int, optional
+        Maximum number of tiles (default is SPRITE_CACHE_SIZE)
+    """
+
+    def __init__(self, fonts, size=SPRITE_CACHE_SIZE):
+        self.__fonts = fonts
+        self.__size = size
+        self.__sprites = OrderedDict()
+
+    def get(self, text, face, size, inverted=False, start=(0, 0)) -> tuple:
+        """ Get a tile and its offset from the text position.
+
+        Parameters
+        ----------
+        start : tuple, optional
+            Fractional part of the text position, the glyphs are rasterized
+            with it (default is (0, 0))
+
+        Returns
+        -------
+        tuple
+            (Image, (x, y)), image is None for a text without ink.
+        """
+        key = (text, face, size, start)
+        sprite = self.__sprites.get(key)
+        if (sprite is None):
+            sprite = self.__rasterize(text, self.__fonts.get(face, size), start)
+            self.__sprites[key] = sprite
+            if (len(self.__sprites) > self.__size):
+                self.__sprites.popitem(last=False)
+        else:
+            self.__sprites.move_to_end(key)
+
+        return (sprite[1] if inverted else sprite[0], sprite[2])
+
+    def __rasterize(self, text, font, start) -> tuple:
+        left, top, right, bottom = font.getbbox(text)
+        # Margin for glyphs drawn left or above the text position.
+        margin_x = max(0, -left) + 1
+        margin_y = max(0, -top) + 1
+        image = Image.new('1', (margin_x + math.ceil(right + start[0]) + 1, margin_y + math.ceil(bottom + start[1]) + 1))
+        ImageDraw.Draw(image).text((margin_x + start[0], margin_y + start[1]), text, fill="white", font=font)
+
+        box = image.getbbox()
+        if (box is None):
+            return (None, None, (0, 0))
+
+        normal = image.crop(box)
+        return (normal, ImageChops.invert(normal), (box[0] - margin_x, box[1] - margin_y))
+
+    def clear(self):
+        self.__sprites.clear()
+
+    def __len__(self):
+        return len(self.__sprites)
 
 
 class Gui(object):
@@ -49,13 +155,27 @@ class Gui(object):
 
     # distance = 1
 
-    def __init__(self, winch):
-        if (config.GUI == GuiType.SH1106_I2C.name):
+    def __init__(self, winch, backend=None, device=None):
+        """ Constructor of Gui class.
+
+        Parameters
+        ----------
+        winch : Winch
+            Winch to display.
+        backend : str, optional
+            Frame compositing, `PIL` or `PACKED` (default is config.GUI_BACKEND)
+        device : luma.core.device.device, optional
+            Device to display on (default is built from config.GUI)
+        """
+        if (device is not None):
+            self.__device = device
+        elif (config.GUI == GuiType.SH1106_I2C.name):
             from luma.core.interface.serial import i2c
             from luma.oled.device import sh1106
+            from openwinch.framebuffer import PageDiffDevice
 
             serial_interface = i2c(port=1, address=LCD_ADDR)
-            self.__device = sh1106(serial_interface, width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0)
+            self.__device = PageDiffDevice(sh1106(serial_interface, width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0))
         elif (config.GUI == GuiType.VGA.name):
             from luma.emulator.device import pygame
 
@@ -64,47 +184,261 @@ class Gui(object):
             from luma.emulator.device import capture
 
             self.__device = capture(width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0, mode='1', transform='scale2x', scale=2, file_template="docs/images/screens/OpenWinch_{0:06}.png")
+        elif (config.GUI == GuiType.DUMMY.name):
+            from luma.core.device import dummy
+
+            self.__device = dummy(width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0, mode='1')
 
         if (self.__device is not None):
             self.__device.show()
 
         self.__winch = winch
-        self.__font = ImageFont.truetype(FONT_TEXT, 8)
-        self.__regulator = framerate_regulator(fps=LCD_FPS)
+        self.__fonts = FontRegistry()
+        self.__fonts.warm(FONT_PRELOAD)
+        self.__sprites = SpriteCache(self.__fonts)
+        # Two frame buffers : one drawn while the other is transferred.
+        if ((backend if backend is not None else config.GUI_BACKEND) == 'PACKED'):
+            from openwinch.packed import (PackedDraw, PackedFrame)
+
+            self.__frames = [PackedFrame((LCD_WIDTH, LCD_HEIGHT)) for _ in range(2)]
+            self.__draws = [PackedDraw(frame, self.__sprites) for frame in self.__frames]
+        else:
+            self.__frames = [Image.new('1', (LCD_WIDTH, LCD_HEIGHT)) for _ in range(2)]
+            self.__draws = [ImageDraw.Draw(frame) for frame in self.__frames]
+        self.__frame = self.__frames[0]
+        self.__draw = self.__draws[0]
+        self.__buffers = threading.Condition()
+        self.__ready = None
+        self.__busy = None
+        self.__transfer_thread = None
+        self.__display_draw_Loop = None
+        self.__stop = threading.Event()
+
+        self.__wakeup = threading.Event()
+        self.__input_time = None
+        self.__input_pending = None
+        self.__view_key = None
+        self.__rendered = 0
+        self.__skipped = 0
+        self.__dropped = 0
+        self.__transferred = 0
+        self.__render_time = Histogram(resolution=0.0001, size=1000)
+        self.__transfer_time = Histogram(resolution=0.0001, size=1000)
+        self.__latency = Histogram(resolution=0.001, size=1000)
 
         self.screen = MainScreen(self)
 
     def getWinch(self):
         return self.__winch
 
-    def __drawBoot(self):
-        if (self.__device is not None):
-            with canvas(self.__device) as draw:
-                font_size = 20
-                name = "OpenWinch"
+    def getFont(self, face, size) -> ImageFont.FreeTypeFont:
+        return self.__fonts.get(face, size)
+
+    def getFonts(self) -> FontRegistry:
+        return self.__fonts
+
+    def getSprites(self) -> SpriteCache:
+        return self.__sprites
+
+    def getFrame(self):
+        """ Get the frame : PIL image, or PackedFrame. """
+        return self.__frame
+
+    def __send(self, frame):
+        if (isinstance(frame, Image.Image)):
+            self.__device.display(frame)
+        elif (hasattr(self.__device, 'displayPages')):
+            self.__device.displayPages(frame.toPages())
+        else:
+            self.__device.display(frame.toImage())
+
+    def drawSprite(self, xy, text, face, size, fill=COLOR_PRIM_FONT):
+        """ Paste a static text on the frame, like `draw.text()` on a plain background. """
+        start = (math.modf(xy[0])[0], math.modf(xy[1])[0])
+        tile, offset = self.__sprites.get(text, face, size, fill == "black", start)
+        if (tile is not None):
+            self.__frame.paste(tile, (int(xy[0]) + offset[0], int(xy[1]) + offset[1]))
+
+    def __clear(self):
+        self.__frame.paste(0, (0, 0, LCD_WIDTH, LCD_HEIGHT))
 
-                x = (LCD_WIDTH / 2) - (len(name) / 2 * font_size / 2)
-                xver = (LCD_WIDTH / 2) + (((len(name) / 2) - 1) * font_size / 2)
-                y = (LCD_HEIGHT / 2) - (font_size / 2)
-                yver = y + font_size
+    def __paintBoot(self):
+        self.__clear()
+        font_size = 20
+        name = "OpenWinch"
 
-                draw.text((x, y), name, fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_LOGO, font_size))
-                draw.text((xver, yver), __version__, fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_TEXT, 8))
+        x = (LCD_WIDTH / 2) - (len(name) / 2 * font_size / 2)
+        xver = (LCD_WIDTH / 2) + (((len(name) / 2) - 1) * font_size / 2)
+        y = (LCD_HEIGHT / 2) - (font_size / 2)
+        yver = y + font_size
+
+        self.drawSprite((x, y), name, FONT_LOGO, font_size)
+        self.drawSprite((xver, yver), __version__, FONT_TEXT, 8)
+
+    def __drawBoot(self):
+        if (self.__device is not None):
+            self.__produce(self.__paintBoot)
 
     def boot(self):
         self.__drawBoot()
+        if (self.__device is not None and config.GUI != GuiType.CAPTURE.name):
+            self.__transfer_thread = threading.Thread(target=self.__transfer_loop, name="displayIO", args=(), daemon=True)
+            self.__transfer_thread.start()
         self.__display_draw_Loop = threading.Thread(target=self.__draw_loop, name="display", args=(), daemon=True)
         self.__display_draw_Loop.start()
 
+    def stop(self):
+        """ Stop the draw and transfer threads. """
+        self.__stop.set()
+        self.__wakeup.set()
+        with self.__buffers:
+            self.__buffers.notify_all()
+
+        for thread in (self.__display_draw_Loop, self.__transfer_thread):
+            if (thread is not None):
+                thread.join()
+        self.__display_draw_Loop = None
+        self.__transfer_thread = None
+
+    def render(self):
+        """ Draw the current screen on the frame. """
+        self.__clear()
+        self.screen.display(self.__draw)
+        return self.__frame
+
     def display(self):
         if (self.__device is not None):
-            with canvas(self.__device) as draw:
-                self.screen.display(draw)
+            self.__produce(self.render)
+
+    def __produce(self, paint):
+        """ Paint a frame in the free buffer, then hand it to the transfer.
+
+        A frame not yet taken by the transfer is stale : its buffer is
+        painted again and the frame dropped. Without transfer thread the frame
+        is sent right away.
+        """
+        with self.__buffers:
+            input_time, self.__input_pending = self.__input_pending, None
+            index = 1 if self.__busy == 0 else 0
+            if (self.__ready is not None):
+                # Transfer behind : drop the stale frame, keep its input.
+                stale_input = self.__ready[1]
+                if (input_time is None or (stale_input is not None and stale_input < input_time)):
+                    input_time = stale_input
+                self.__ready = None
+                self.__dropped += 1
+
+        begin = time.monotonic()
+        self.__frame = self.__frames[index]
+        self.__draw = self.__draws[index]
+        paint()
+        self.__render_time.record(time.monotonic() - begin)
+
+        with self.__buffers:
+            self.__ready = (index, input_time)
+            self.__buffers.notify()
+
+        if (self.__transfer_thread is None):
+            self.__transfer()
+
+    def __transfer(self, timeout=None) -> bool:
+        """ Send the last painted frame to the device. """
+        with self.__buffers:
+            if (self.__ready is None and timeout is not None and not self.__stop.is_set()):
+                self.__buffers.wait(timeout)
+            if (self.__ready is None):
+                return False
+            index, input_time = self.__ready
+            self.__ready = None
+            self.__busy = index
+
+        begin = time.monotonic()
+        try:
+            self.__send(self.__frames[index])
+        finally:
+            with self.__buffers:
+                self.__busy = None
+
+        end = time.monotonic()
+        self.__transfer_time.record(end - begin)
+        if (input_time is not None):
+            self.__latency.record(end - input_time)
+        self.__transferred += 1
+        return True
+
+    def __transfer_loop(self):
+        while (not self.__stop.is_set()):
+            try:
+                self.__transfer(timeout=1)
+            except Exception as e:
+                logger.error("Display transfer failed : %s" % e)
+
+    def viewKey(self) -> tuple:
+        """ Get a key of everything shown : equal keys give the same frame. """
+        return (type(self.screen),
+                self.cursor_pos,
+                self.__winch.getState(),
+                self.__winch.getBattery(),
+                self.__winch.getRemote(),
+                self.screen.viewKey())
+
+    def refresh(self) -> bool:
+        """ Display the screen when animated or when its view changed.
+
+        Returns
+        -------
+        bool
+            True when a frame was rendered.
+        """
+        key = self.viewKey()
+        if (key == self.__view_key and not self.screen.isAnimated()):
+            self.__skipped += 1
+            return False
+
+        self.display()
+        self.__view_key = key
+        self.__rendered += 1
+        return True
+
+    def getFrameRate(self) -> float:
+        """ Get frame rate : full while animated or just after an input. """
+        if (self.screen.isAnimated()):
+            return LCD_FPS
+        if (self.__input_time is not None and time.monotonic() - self.__input_time < LCD_INPUT_BOOST):
+            return LCD_FPS
+        return LCD_IDLE_FPS
+
+    def getFrameStats(self) -> dict:
+        """ Get frame counters, render and transfer times, and input-to-photon latency. """
+        return {
+            "rendered": self.__rendered,
+            "skipped": self.__skipped,
+            "dropped": self.__dropped,
+            "transferred": self.__transferred,
+            "render": self.__render_time.toDict(),
+            "transfer": self.__transfer_time.toDict(),
+            "latency": self.__latency.toDict(),
+        }
+
+    def resetFrameStats(self):
+        self.__rendered = 0
+        self.__skipped = 0
+        self.__dropped = 0
+        self.__transferred = 0
+        self.__render_time.reset()
+        self.__transfer_time.reset()
+        self.__latency.reset()
 
     def getPos(self):
         return self.cursor_pos
 
     def enter(self, key):
+        with self.__buffers:
+            self.__input_time = time.monotonic()
+            if (self.__input_pending is None):
+                self.__input_pending = self.__input_time
+        self.__wakeup.set()
+
         # Directional Common
         if (InputType.RIGHT == key):
             self.cursor_pos += 1
@@ -137,22 +471,22 @@ class Gui(object):
             battery_symbol = ""
 
         battery_x = 2
-        draw.text((battery_x, 0), battery_symbol, fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_ICON, 8))
-        draw.text((battery_x + 15, 1), "%s%%" % battery_value, fill=COLOR_PRIM_FONT, font=self.__font)
+        self.drawSprite((battery_x, 0), battery_symbol, FONT_ICON, 8)
+        draw.text((battery_x + 15, 1), "%s%%" % battery_value, fill=COLOR_PRIM_FONT, font=self.getFont(FONT_TEXT, 8))
 
         # Wifi
         wifi_x = 105
-        draw.text((wifi_x, 0), "", fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_ICON, 8))
-        draw.text((wifi_x + 7, 1), "%s " % self.__winch.getRemote(), fill=COLOR_PRIM_FONT, font=self.__font)
+        self.drawSprite((wifi_x, 0), "", FONT_ICON, 8)
+        draw.text((wifi_x + 7, 1), "%s " % self.__winch.getRemote(), fill=COLOR_PRIM_FONT, font=self.getFont(FONT_TEXT, 8))
 
     def createValue(self, draw, title, value):
-        draw.text((0, 0), title, fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_TEXT, 12))
+        self.drawSprite((0, 0), title, FONT_TEXT, 12)
         draw.rectangle([0, 12, LCD_WIDTH, 12], fill="white", outline="white")
-        draw.text((2, 18), "%s" % value, fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_TEXT, 14))
+        draw.text((2, 18), "%s" % value, fill=COLOR_PRIM_FONT, font=self.getFont(FONT_TEXT, 14))
 
         y = 0.78 * LCD_HEIGHT
         draw.rectangle([0, y, LCD_WIDTH, LCD_HEIGHT], fill="white", outline="white")
-        draw.text((0, 0.80 * LCD_HEIGHT), "exit to save...", fill="black", font=ImageFont.truetype(FONT_TEXT, 12))
+        self.drawSprite((0, 0.80 * LCD_HEIGHT), "exit to save...", FONT_TEXT, 12, fill="black")
 
     def createMenuScroll(self, draw, items, selected_item=None):
         font_size = 12
@@ -172,8 +506,8 @@ class Gui(object):
                 draw.rectangle([0, draw_view_pos + y, LCD_WIDTH, draw_view_pos + y + font_size], fill="white", outline="white")
 
             if (selected_item is not None and selected_item == item):
-                draw.text((LCD_WIDTH - font_size, draw_view_pos + y), "", fill=text_color, font=ImageFont.truetype(FONT_ICON, font_size - 2))
-            draw.text((1, draw_view_pos + y), item, fill=text_color, font=ImageFont.truetype(FONT_TEXT, font_size))
+                self.drawSprite((LCD_WIDTH - font_size, draw_view_pos + y), "", FONT_ICON, font_size - 2, fill=text_color)
+            self.drawSprite((1, draw_view_pos + y), item, FONT_TEXT, font_size, fill=text_color)
             draw_cursor_pos += 1
 
     def createMenuIcon(self, draw, items):
@@ -192,20 +526,23 @@ class Gui(object):
                 fnt = "white"
 
             draw.rectangle([draw_cursor_pos * btn_width, btn_height, (draw_cursor_pos + 1) * btn_width, LCD_HEIGHT], fill=bgd, outline=fnt)
-            draw.text((btn_start + draw_cursor_pos * btn_width, 0.79 * LCD_HEIGHT), items[draw_cursor_pos], fill=fnt, font=ImageFont.truetype(FONT_ICON, font_size))
+            self.drawSprite((btn_start + draw_cursor_pos * btn_width, 0.79 * LCD_HEIGHT), items[draw_cursor_pos], FONT_ICON, font_size, fill=fnt)
             draw_cursor_pos += 1
 
     def __draw_loop(self):
-        t = threading.currentThread()
         if (config.GUI != GuiType.DISABLE.name and config.GUI != GuiType.CAPTURE.name):
-            while getattr(t, "do_run", True):
-                with self.__regulator:
-                    if (self.__winch.getState().isBoot):
-                        self.display()
-                    else:
-                        self.__drawBoot()
-        else:
-            self.extractScreen
+            while (not self.__stop.is_set()):
+                if (self.__winch.getState().isBoot):
+                    self.refresh()
+                elif (self.__view_key is not None):
+                    self.__drawBoot()
+                    self.__view_key = None
+
+                # Input wakes up the loop before the next frame.
+                self.__wakeup.wait(1 / self.getFrameRate())
+                self.__wakeup.clear()
+        # CAPTURE : screens of the documentation are written offline by
+        # openwinch.gallery, not from the live winch.
 
     def extractScreen(self):
         # Capture mode for DOC
@@ -295,6 +632,13 @@ class ScreenBase(ABC):
     def enter(self, cursor_pos):
         pass
 
+    def viewKey(self) -> tuple:
+        """ Get screen values not in the `Gui.viewKey()`. """
+        return ()
+
+    def isAnimated(self) -> bool:
+        return False
+
 
 class MainScreen(ScreenBase):
     __ITEMS_IDLE = ["", "", ""]
@@ -305,6 +649,19 @@ class MainScreen(ScreenBase):
     def countItems(self) -> int:
         return len(self.__ITEMS_IDLE)
 
+    def viewKey(self) -> tuple:
+        # Distance as bar end in pixels.
+        return (self._winch.getSpeedTarget(), int(self.distanceBarEnd()))
+
+    def distanceBarEnd(self) -> float:
+        """ Get the right of the distance bar, clamped to the screen. """
+        marg = 4
+        percent = 1 / WINCH_DISTANCE * self._winch.getDistance()
+        return min(max((LCD_WIDTH - marg) * percent, marg), LCD_WIDTH - 1)
+
+    def isAnimated(self) -> bool:
+        return self._winch.getState().isRun
+
     def display(self, draw):
         self.__count += 2
         self.__inver = True
@@ -314,13 +671,12 @@ class MainScreen(ScreenBase):
 
         # Speed
         speed_x = 54
-        draw.text((speed_x, 14), "%s" % self._winch.getSpeedTarget(), fill="white", font=ImageFont.truetype(FONT_TEXT, 35))
-        draw.text((speed_x + 40, 28), SPEED_UNIT, fill="white", font=ImageFont.truetype(FONT_TEXT, 15))  # Very good
+        draw.text((speed_x, 14), "%s" % self._winch.getSpeedTarget(), fill="white", font=self._gui.getFont(FONT_TEXT, 35))
+        self._gui.drawSprite((speed_x + 40, 28), SPEED_UNIT, FONT_TEXT, 15)  # Very good
 
         # Distance
         marg = 4
-        percent = 1 / WINCH_DISTANCE * self._winch.getDistance()
-        draw.rectangle([0 + marg, 11, ((LCD_WIDTH - marg) * percent), 14], fill="white", outline="white")
+        draw.rectangle([0 + marg, 11, self.distanceBarEnd(), 14], fill="white", outline="white")
 
         if (self._winch.getState().isStop):
             self._gui.createMenuIcon(draw, self.__ITEMS_IDLE)
@@ -396,11 +752,11 @@ class ManualPositionScreen(ScreenBase):
         return sys.maxsize
 
     def display(self, draw):
-        draw.text((1, 1), "Move with Right/Left button.", fill=COLOR_PRIM_FONT, font=ImageFont.truetype(FONT_TEXT, 12))
+        self._gui.drawSprite((1, 1), "Move with Right/Left button.", FONT_TEXT, 12)
 
         y = 0.78 * LCD_HEIGHT
         draw.rectangle([0, y, LCD_WIDTH, LCD_HEIGHT], fill="white", outline="white")
-        draw.text((0, 0.80 * LCD_HEIGHT), "enter to exit.", fill="black", font=ImageFont.truetype(FONT_TEXT, 12))
+        self._gui.drawSprite((0, 0.80 * LCD_HEIGHT), "enter to exit.", FONT_TEXT, 12, fill="black")
 
     def enter(self, cursor_pos):
         self._gui.screen = MenuScreen(self._gui)
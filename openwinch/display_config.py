@@ -14,3 +14,19 @@ COLOR_SELC_BACK = "white"
 FONT_TEXT = "openwinch/fonts/FreePixel.ttf"
 FONT_ICON = "openwinch/fonts/fontawesome-webfont.ttf"
 FONT_LOGO = "openwinch/fonts/SLANT.TTF"
+
+# Fonts (face, size) used by screens, loaded when the Gui starts.
+FONT_PRELOAD = [
+    (FONT_TEXT, 8),
+    (FONT_TEXT, 12),
+    (FONT_TEXT, 14),
+    (FONT_TEXT, 15),
+    (FONT_TEXT, 35),
+    (FONT_ICON, 8),
+    (FONT_ICON, 10),
+    (FONT_ICON, 12),
+    (FONT_LOGO, 20),
+]
+
+# Maximum number of text tiles kept by the sprite cache.
+SPRITE_CACHE_SIZE = 256
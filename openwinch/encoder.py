@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.hardware_config import ENCODER_PPR
+
+from array import array
+
+from gpiozero import InputDevice
+
+
+class RotationEncoder(object):
+    """ Drum rotation from hall or quadrature encoder pulses.
+
+    Pulses are counted from the GPIO edge callbacks. The callback only
+    increments the counter and stores the pulse ticks in a preallocated ring
+    buffer : no allocation, no lock, no logging, so it keeps up with high
+    pulse rates while other threads hold the GIL.
+
+    Speed and acceleration are estimated in O(1) from the last pulses of the
+    ring buffer.
+
+    Parameters
+    ----------
+    pin_a : int
+        GPIO of channel A. Inputs are pulled up (open-collector sensors) and
+        pulses are counted on falling edges.
+    pin_b : int, optional
+        GPIO of quadrature channel B giving the direction (reverse when low).
+        Without it (hall sensor), the direction is set with `setDirection()`.
+    pulses_per_rotation : int, optional
+        Pulses for one drum rotation (default is ENCODER_PPR)
+    window : int, optional
+        Pulses used by the speed estimate (default is 8)
+    size : int, optional
+        Ring buffer size, rounded to a power of two (default is 1024)
+    pin_factory : Factory, optional
+        gpiozero pin factory.
+    """
+
+    def __init__(self, pin_a, pin_b=None, pulses_per_rotation=ENCODER_PPR, window=8, size=1024, pin_factory=None):
+        size = 1 << max(size - 1, 2 * window).bit_length()
+
+        self.__pulses_per_rotation = pulses_per_rotation
+        self.__window = window
+        self.__mask = size - 1
+        self.__ticks = array('d', bytes(8 * size))
+        self.__directions = array('b', bytes(size))
+        self.__count = 0
+        self.__index = 0
+        self.__offset = 0
+        self.__direction = 1
+
+        self.__a = InputDevice(pin_a, pull_up=True, pin_factory=pin_factory)
+        self.__b = None
+        if (pin_b is not None):
+            self.__b = InputDevice(pin_b, pull_up=True, pin_factory=pin_factory)
+
+        self.__factory = self.__a.pin_factory
+        self.__pin_b = self.__b.pin if self.__b is not None else None
+        self.__a.pin.edges = 'falling'
+        self.__a.pin.when_changed = self._pulse
+
+    def _pulse(self, ticks, state):
+        """ Edge callback of channel A. """
+        if (self.__pin_b is not None):
+            direction = 1 if self.__pin_b.state else -1
+        else:
+            direction = self.__direction
+
+        index = self.__index & self.__mask
+        self.__ticks[index] = ticks
+        self.__directions[index] = direction
+        self.__count += direction
+        self.__index += 1
+
+    def close(self):
+        self.__a.close()
+        if (self.__b is not None):
+            self.__b.close()
+
+    def setDirection(self, direction):
+        """ Set direction of hall sensor pulses (1 or -1). """
+        self.__direction = direction
+
+    def reset(self):
+        """ Set the current position as origin. """
+        self.__offset = self.__count
+
+    def getPulses(self) -> int:
+        """ Get pulses counted since the last reset. """
+        return self.__count - self.__offset
+
+    def getRotation(self) -> float:
+        """ Get rotations since the last reset. """
+        return (self.__count - self.__offset) / self.__pulses_per_rotation
+
+    def __rate(self, last, now) -> float:
+        """ Pulse rate over the window ending at index `last`. """
+        first = self.__ticks[(last - self.__window) & self.__mask]
+        latest = self.__ticks[last & self.__mask]
+        period = self.__factory.ticks_diff(latest, first) / self.__window
+        if (now is not None):
+            # No pulse for a while : the drum slows down.
+            period = max(period, self.__factory.ticks_diff(now, latest))
+
+        if (period <= 0):
+            return 0.0
+        return self.__directions[last & self.__mask] / period
+
+    def getSpeed(self) -> float:
+        """ Get drum speed in rotations per second. """
+        last = self.__index - 1
+        if (last < self.__window):
+            return 0.0
+
+        return self.__rate(last, self.__factory.ticks()) / self.__pulses_per_rotation
+
+    def getAcceleration(self) -> float:
+        """ Get drum acceleration in rotations per second². """
+        last = self.__index - 1
+        previous = last - self.__window
+        if (previous < self.__window):
+            return 0.0
+
+        ticks = self.__ticks
+        mask = self.__mask
+        # Time between the middle of both windows.
+        delay = self.__factory.ticks_diff(ticks[last & mask], ticks[previous & mask])
+        if (delay <= 0):
+            return 0.0
+
+        return (self.__rate(last, None) - self.__rate(previous, None)) / delay / self.__pulses_per_rotation
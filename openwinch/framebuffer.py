@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from PIL import Image
+
+SH1106_SET_PAGE = 0xB0
+SH1106_SET_LOW_COLUMN = 0x00
+SH1106_SET_HIGH_COLUMN = 0x10
+
+
+def toPages(image) -> list:
+    """ Convert a 1-bit image to SH1106/SSD1306 pages.
+
+    A page is a row of 8 pixels high : one byte per column, least significant
+    bit on top.
+
+    Returns
+    -------
+    list
+        One `bytes` of `width` columns per page.
+    """
+    pages = image.height // 8
+    # Rotated, each image row is one column with its bottom pixel first.
+    columns = image.transpose(Image.Transpose.ROTATE_270).tobytes()
+    return [columns[pages - 1 - page::pages] for page in range(pages)]
+
+
+def diffColumns(previous, current, gap=4) -> list:
+    """ Get changed column ranges of a page.
+
+    Ranges separated by less than `gap` unchanged columns are merged, a new
+    transfer costs more than a few bytes.
+
+    Returns
+    -------
+    list
+        List of (start, end) with end excluded.
+    """
+    ranges = []
+    start = None
+    end = None
+    for column, (old, new) in enumerate(zip(previous, current)):
+        if (old != new):
+            if (start is None):
+                start = column
+            elif (column - end >= gap):
+                ranges.append((start, end))
+                start = column
+            end = column + 1
+
+    if (start is not None):
+        ranges.append((start, end))
+    return ranges
+
+
+class PageDiffDevice(object):
+    """ SH1106 device sending only the pages changed since the last frame.
+
+    The last transmitted frame is kept as pages. Each new frame is compared
+    page by page, and only changed column ranges are written to the display
+    RAM. Other attributes are read from the device, so it can be used with
+    `luma.core.render.canvas`.
+
+    Parameters
+    ----------
+    device : luma.oled.device.sh1106
+        Device to drive.
+    gap : int, optional
+        Unchanged columns merged into a transfer (default is 4)
+    """
+
+    def __init__(self, device, gap=4):
+        self.__device = device
+        self.__gap = gap
+        self.__offset = getattr(device, '_page_address_offset', 0)
+        self.__pages = None
+
+        self.__frames = 0
+        self.__transfers = 0
+        self.__bytes = 0
+
+    def __getattr__(self, name):
+        return getattr(self.__device, name)
+
+    def __write(self, page, start, data):
+        column = self.__offset + start
+        self.__device.command(SH1106_SET_PAGE | page,
+                              SH1106_SET_LOW_COLUMN | (column & 0x0F),
+                              SH1106_SET_HIGH_COLUMN | (column >> 4))
+        self.__device.data(list(data))
+        self.__transfers += 1
+        self.__bytes += len(data)
+
+    def display(self, image):
+        """ Send the changed parts of a 1-bit image. """
+        self.displayPages(toPages(self.__device.preprocess(image)))
+
+    def displayPages(self, pages):
+        """ Send the changed parts of a frame given as pages (no rotation). """
+        previous = self.__pages
+        self.__frames += 1
+
+        for page, data in enumerate(pages):
+            if (previous is None):
+                self.__write(page, 0, data)
+            elif (data != previous[page]):
+                for start, end in diffColumns(previous[page], data, self.__gap):
+                    self.__write(page, start, data[start:end])
+
+        self.__pages = pages
+
+    def clear(self):
+        self.display(Image.new(self.__device.mode, self.__device.size))
+
+    def invalidate(self):
+        """ Send the whole next frame (display RAM not trusted anymore). """
+        self.__pages = None
+
+    def getStats(self) -> dict:
+        """ Get frames displayed, page transfers and data bytes sent. """
+        return {
+            "frames": self.__frames,
+            "transfers": self.__transfers,
+            "bytes": self.__bytes,
+        }
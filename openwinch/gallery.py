@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Screen gallery of the documentation.
+
+Every screen of `GALLERY` is rendered from a static winch, without control
+loop nor display thread, and written like the `CAPTURE` display does
+(`docs/images/screens/OpenWinch_XXXXXX.png`). Screens are rendered and
+encoded by a process pool.
+
+Usage : python -m openwinch.gallery [--output docs/images/screens] [--workers N]
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import argparse
+import os
+import time
+
+from openwinch.display import (Gui,
+                               MainScreen,
+                               MenuScreen,
+                               ManualPositionScreen,
+                               SecurityDistanceScreen,
+                               ModeSelectorScreen,
+                               VelocityStartScreen,
+                               VelocityStopScreen)
+from openwinch.hardware_config import (LCD_HEIGHT, LCD_WIDTH)
+from openwinch.state import State
+
+FILE_TEMPLATE = "OpenWinch_{0:06}.png"
+
+# (screen, winch state, cursor position or None for the screen default)
+GALLERY = [(MainScreen, state, 0) for state in State if state.isBoot]
+GALLERY += [
+    (MainScreen, State.IDLE, 1),
+    (MainScreen, State.IDLE, 2),
+    (MainScreen, State.RUNNING, 1),
+    (MenuScreen, State.IDLE, 0),
+    (MenuScreen, State.IDLE, 1),
+    (MenuScreen, State.IDLE, 2),
+    (MenuScreen, State.IDLE, 3),
+    (MenuScreen, State.IDLE, 4),
+    (MenuScreen, State.IDLE, 5),
+    (ManualPositionScreen, State.IDLE, None),
+    (SecurityDistanceScreen, State.IDLE, None),
+    (ModeSelectorScreen, State.IDLE, 0),
+    (ModeSelectorScreen, State.IDLE, 1),
+    (ModeSelectorScreen, State.IDLE, 2),
+    (VelocityStartScreen, State.IDLE, None),
+    (VelocityStopScreen, State.IDLE, None),
+]
+
+
+class StaticWinch(object):
+    """ Winch values shown by the screens, without control loop. """
+
+    def __init__(self, state=State.IDLE):
+        self.state = state
+
+    def getState(self):
+        return self.state
+
+    def getBattery(self):
+        return 80
+
+    def getRemote(self):
+        return 12
+
+    def getSpeedTarget(self):
+        return 25
+
+    def getDistance(self):
+        return 35
+
+
+def newGui() -> Gui:
+    """ Get a gui of a `StaticWinch` on a dummy device, whatever config.GUI is. """
+    from luma.core.device import dummy
+
+    return Gui(StaticWinch(), 'PIL', device=dummy(width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0, mode='1'))
+
+
+# Gui of the worker process, built once by `__init_worker`.
+__gui = None
+
+
+def __init_worker():
+    global __gui
+    __gui = newGui()
+
+
+def render(gui, screen, state, cursor):
+    """ Render a screen of a gui on a `StaticWinch`. """
+    gui.getWinch().state = state
+    gui.screen = screen(gui)
+    if (cursor is not None):
+        gui.cursor_pos = cursor
+    return gui.render()
+
+
+def __capture(job) -> str:
+    from luma.emulator.device import capture
+
+    path, screen, state, cursor = job
+    frame = render(__gui, screen, state, cursor)
+    # The template has no field : each device writes one file.
+    device = capture(width=LCD_WIDTH, height=LCD_HEIGHT, rotate=0, mode='1', transform='scale2x', scale=2, file_template=path)
+    device.display(frame)
+    return path
+
+
+def generate(output, gallery=GALLERY, workers=None) -> list:
+    """ Write the screens of a gallery in a directory.
+
+    Parameters
+    ----------
+    output : str
+        Directory of the images.
+    gallery : list, optional
+        List of (screen, state, cursor) (default is GALLERY)
+    workers : int, optional
+        Worker processes (default is the CPU count)
+
+    Returns
+    -------
+    list
+        Paths of the images, in gallery order.
+    """
+    os.makedirs(output, exist_ok=True)
+    jobs = [(os.path.join(output, FILE_TEMPLATE.format(index + 1)), screen, state, cursor)
+            for index, (screen, state, cursor) in enumerate(gallery)]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=__init_worker) as executor:
+        return list(executor.map(__capture, jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', default="docs/images/screens")
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    begin = time.perf_counter()
+    paths = generate(args.output, workers=args.workers)
+    print("%d screens written to %s in %.2fs" % (len(paths), args.output, time.perf_counter() - begin))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,19 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
+from openwinch.battery import (BatterySampler, openBattery)
+from openwinch.config import config
+from openwinch.constantes import WINCH_DISTANCE
 from openwinch.controller import Winch
 from openwinch.logger import logger
+from openwinch.physics import DrumModel
+from openwinch.utils import distance2rotate
 
 from abc import ABC, abstractmethod
 from enum import Enum, unique
 
+import threading
+
 
 @unique
 class SpeedMode(Enum):
@@ -22,12 +29,18 @@ class SpeedMode(Enum):
 class Board(ABC):
 
     _winch = None
+    _battery = None
     _reverse = False
     _speed_mode = SpeedMode.LOW
     _rotation_from_init = 0
 
     def __init__(self, winch: Winch):
         self._winch = winch
+        self._battery = BatterySampler(openBattery(clock=winch.getClock()), config.BATTERY_PERIOD, winch.getClock())
+
+    def startSampling(self):
+        """ Start background sampling of slow sensors. """
+        self._battery.start()
 
     @abstractmethod
     def initialize(self):
@@ -35,6 +48,7 @@ class Board(ABC):
 
     @abstractmethod
     def emergency(self):
+        """ Cut the power and set the throttle to 0, now. """
         pass
 
     @abstractmethod
@@ -61,50 +75,85 @@ class Board(ABC):
     def getSpeedMode(self) -> SpeedMode:
         return self._speed_mode
 
-    @abstractmethod
     def getBattery(self) -> int:
-        return 100
+        """ Get cached battery level in percent. """
+        return self._battery.getValue()
+
+    def getBatterySample(self) -> tuple:
+        """ Get cached battery level as (percent, timestamp). """
+        return self._battery.getSample()
+
+    def getOutputStats(self) -> dict:
+        """ Get write counters of outputs by name. """
+        return {}
 
     def getRotationFromBegin(self):
         return self._rotation_from_init
 
     def getRotationFromEnd(self):
-        return 60
+        """ Get turns of rope left before the end of the rope (WINCH_DISTANCE). """
+        return distance2rotate(WINCH_DISTANCE) - self.getRotationFromBegin()
 
 
 class Emulator(Board):
+    """ Board emulated by a physical model of the drum (see DrumModel).
+
+    The model is integrated up to the winch clock on each access, so it runs
+    faster than real time on a virtual clock.
+    """
+
     __value = 0
-    __init = False
+
+    def __init__(self, winch: Winch):
+        super().__init__(winch)
+        self.__clock = winch.getClock()
+        self.__lock = threading.Lock()
+        self.__model = DrumModel()
+        self.__last = self.__clock()
+
+    def __update(self):
+        with self.__lock:
+            now = self.__clock()
+            self.__model.step(now - self.__last)
+            self.__last = now
+            self._rotation_from_init = self.__model.getRotation()
 
     def initialize(self):
+        self.__update()
         super().initialize()
-        self.__init = True
+        self.__model.setRotation(self._rotation_from_init)
+        self.__model.setPower(True)
         logger.info("IO : Emulator Initialized !")
 
     def emergency(self):
-        self.__init = False
+        self.__update()
+        self.__model.setPower(False)
+        self.__model.setThrottle(0)
+        self.__value = 0
         logger.info("IO : Emulator Emergency mode !")
 
     def setThrottleValue(self, value):
-        if (self.__value > 0):
-            self._rotation_from_init -= 1
-        elif (self.__init):
-            self._rotation_from_init += 1
+        self.__update()
+        self.__model.setThrottle(value)
 
         if (self.__value != value):
             self.__value = value
             logger.debug("IO : Throttle to %s" % self.__value)
 
     def getThrottleValue(self):
-        logger.debug("IO : Throttle to %s" % self.__value)
+        return self.__value
 
     def setSpeedMode(self, speed_mode):
         super().setSpeedMode(speed_mode)
 
     def setReverse(self, enable):
+        self.__update()
         super().setReverse(enable)
+        self.__model.setReverse(enable)
 
-    def getBattery(self) -> int:
-        power_now = open("/sys/class/power_supply/BAT0/energy_now", "r").readline()
-        power_full = open("/sys/class/power_supply/BAT0/energy_full", "r").readline()
-        return int(float(power_now) / float(power_full) * 100)
+    def getRotationFromBegin(self):
+        self.__update()
+        return self._rotation_from_init
+
+    def getModel(self) -> DrumModel:
+        return self.__model
@@ -5,16 +5,22 @@
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
 from openwinch.controller import Winch
+from openwinch.encoder import RotationEncoder
 from openwinch.hardware import (Board, SpeedMode)
-from openwinch.hardware_config import (IN_KEY_ENTER,
+from openwinch.hardware_config import (IN_ENC_A,
+                                       IN_ENC_B,
+                                       IN_KEY_ENTER,
                                        IN_KEY_LEFT,
                                        IN_KEY_RIGHT,
                                        OUT_REVERSE,
                                        OUT_SPD,
                                        OUT_PWR,
-                                       OUT_THROTTLE)
+                                       OUT_THROTTLE,
+                                       PWM_RESOLUTION,
+                                       RELAY_MIN_TOGGLE)
 from openwinch.input import InputType
 from openwinch.logger import logger
+from openwinch.output import ShadowOutput
 
 from gpiozero import Button, PWMOutputDevice, OutputDevice
 
@@ -25,6 +31,7 @@ class RaspberryPi(Board):
     __reverse_cmd = None
     __speed_cmd = None
     __throttle_cmd = None
+    __encoder = None
     __key_enter_btn = None
     __key_left_btn = None
     __key_right_btn = None
@@ -32,19 +39,23 @@ class RaspberryPi(Board):
     def __init__(self, winch: Winch):
         logger.debug("IO : Initialize Hardware...")
         super().__init__(winch)
+        clock = winch.getClock()
 
         # Power
-        self.__power_cmd = OutputDevice(OUT_PWR)
-        self.__power_cmd.off()
+        self.__power_cmd = ShadowOutput(OutputDevice(OUT_PWR), min_toggle=RELAY_MIN_TOGGLE, clock=clock)
+        self.__power_cmd.write(False, force=True)
 
         # Reverse
-        self.__reverse_cmd = OutputDevice(OUT_REVERSE)
+        self.__reverse_cmd = ShadowOutput(OutputDevice(OUT_REVERSE), min_toggle=RELAY_MIN_TOGGLE, clock=clock)
 
         # Speed mode (Lo, Medium, Hi)
-        self.__speed_cmd = OutputDevice(OUT_SPD)
+        self.__speed_cmd = ShadowOutput(OutputDevice(OUT_SPD), min_toggle=RELAY_MIN_TOGGLE, clock=clock)
 
         # Throlle
-        self.__throttle_cmd = PWMOutputDevice(OUT_THROTTLE)
+        self.__throttle_cmd = ShadowOutput(PWMOutputDevice(OUT_THROTTLE), resolution=PWM_RESOLUTION, clock=clock)
+
+        # Rotation
+        self.__encoder = RotationEncoder(IN_ENC_A, IN_ENC_B)
 
         # Move
         self.__key_enter_btn = Button(IN_KEY_ENTER)
@@ -71,38 +82,60 @@ class RaspberryPi(Board):
     def initialize(self):
         """ Initialize """
         super().initialize()
+        self.__encoder.reset()
         self.setReverse(False)
         self.setSpeedMode(SpeedMode.LOW)
-        self.__throttle_cmd.value = 0
-        self.__throttle_cmd.on()
+        self.__throttle_cmd.write(0)
 
-        self.__power_cmd.on()
+        self.__power_cmd.write(True)
         logger.info("IO : Hardware Initialized !")
 
     def emergency(self):
         logger.debug("IO : Shutdown power !")
-        self.__power_cmd.off()
+        self.__power_cmd.write(False, force=True)
+        self.__throttle_cmd.write(0, force=True)
+
+    def __flushRelays(self):
+        """ Apply relay changes deferred by the toggle interval. """
+        self.__power_cmd.flush()
+        self.__reverse_cmd.flush()
+        self.__speed_cmd.flush()
 
     def setThrottleValue(self, value):
-        if (self.__throttle_cmd.value != value):
-            logger.debug("IO : Throttle to %s" % value)
-            self.__throttle_cmd.value = value
+        self.__flushRelays()
+        if (self.__reverse_cmd.isPending()):
+            # Direction not switched yet : the motor would drive the wrong way.
+            value = 0
+
+        if (self.__throttle_cmd.write(value)):
+            logger.debug("IO : Throttle to %s" % self.__throttle_cmd.getValue())
 
     def getThrottleValue(self):
-        return self.__throttle_cmd.value
+        return self.__throttle_cmd.getValue()
+
+    def getOutputStats(self) -> dict:
+        return {
+            "power": self.__power_cmd.getStats(),
+            "reverse": self.__reverse_cmd.getStats(),
+            "speed": self.__speed_cmd.getStats(),
+            "throttle": self.__throttle_cmd.getStats(),
+        }
+
+    def getRotationFromBegin(self):
+        return self.__encoder.getRotation()
+
+    def getEncoder(self) -> RotationEncoder:
+        return self.__encoder
 
     def setSpeedMode(self, speed_mode):
         super().setSpeedMode(speed_mode)
         if (self._speed_mode == SpeedMode.LOW):
-            self.__speed_cmd.off()
+            self.__speed_cmd.write(False)
         # elif (self._speed_mode == SpeedMode.MEDIUM):
-        #     self.__speed_cmd.off()
+        #     self.__speed_cmd.write(False)
         elif (self._speed_mode == SpeedMode.HIGH):
-            self.__speed_cmd.on()
+            self.__speed_cmd.write(True)
 
     def setReverse(self, enable):
         super().setReverse(enable)
-        if (self._reverse):
-            self.__reverse_cmd.off()
-        else:
-            self.__reverse_cmd.on()
+        self.__reverse_cmd.write(not self._reverse)
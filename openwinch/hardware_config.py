@@ -29,8 +29,23 @@ OUT_PWR = 25
 # Throttle
 OUT_THROTTLE = 18
 
+# Throttle PWM steps (None to disable quantization)
+PWM_RESOLUTION = 255
+
+# Minimum delay between two toggles of a relay (seconds)
+RELAY_MIN_TOGGLE = 0.1
+
+# Rotation encoder (quadrature A/B)
+IN_ENC_A = 5
+IN_ENC_B = 6
+ENCODER_PPR = 20
+
 LCD_WIDTH = 128
 LCD_HEIGHT = 64
 LCD_ADDR = 0x3c
 
 LCD_FPS = 10
+# Frame rate without animation nor recent input
+LCD_IDLE_FPS = 2
+# Delay at full frame rate after an input (seconds)
+LCD_INPUT_BOOST = 2
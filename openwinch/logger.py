@@ -4,10 +4,15 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
+from openwinch.config import config
+
 import logging
 
 # from logging.config import fileConfig
 
+# Size of the debug log file before rotation (bytes).
+LOG_FILE_SIZE = 5 * 1024 * 1024
+
 
 def __initLogger():
     """ Initialize logger. """
@@ -18,21 +23,23 @@ def __initLogger():
     log.setLevel(logging.DEBUG)
     log.debug("Initialize Logger...")
 
-    # Create file handler which logs even debug messages
-    fh = logging.FileHandler('openwinch.log')
-    fh.setLevel(logging.DEBUG)
+    # Create formatter
+    formatter = logging.Formatter('%(asctime)s - %(name)s.%(threadName)s - %(levelname)s - %(message)s')
+
+    # Create file handler which logs even debug messages (none without file)
+    if (config.LOG_FILE):
+        # Imported here, logging.handlers pulls socket, pickle and queue.
+        from logging.handlers import RotatingFileHandler
+
+        fh = RotatingFileHandler(config.LOG_FILE, maxBytes=LOG_FILE_SIZE, backupCount=1)
+        fh.setLevel(logging.DEBUG)
+        fh.setFormatter(formatter)
+        log.addHandler(fh)
 
     # Create console handler with a info log level
     ch = logging.StreamHandler()
     ch.setLevel(logging.INFO)
-
-    # Create formatter and add it to the handlers
-    formatter = logging.Formatter('%(asctime)s - %(name)s.%(threadName)s - %(levelname)s - %(message)s')
-    fh.setFormatter(formatter)
     ch.setFormatter(formatter)
-
-    # Add the handlers to the logger
-    log.addHandler(fh)
     log.addHandler(ch)
 
     return log
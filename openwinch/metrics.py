@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+import math
+
+
+class Histogram(object):
+    """ Fixed-width bucket histogram.
+
+    Recording a value is O(1) and never allocates, so it can be used from the
+    control loop. Values above the last bucket are accumulated in an overflow
+    bucket.
+
+    Parameters
+    ----------
+    resolution : float, optional
+        Width of one bucket (default is 100 µs)
+    size : int, optional
+        Number of buckets (default is 1000)
+    """
+
+    def __init__(self, resolution=0.0001, size=1000):
+        self.__resolution = resolution
+        self.__size = size
+        self.reset()
+
+    def reset(self):
+        """ Clear all recorded values. """
+        self.__buckets = [0] * (self.__size + 1)
+        self.__count = 0
+        self.__total = 0.0
+        self.__min = math.inf
+        self.__max = -math.inf
+
+    def record(self, value):
+        """ Add a value to the histogram. """
+        index = int(value / self.__resolution)
+        if (index > self.__size):
+            index = self.__size
+        elif (index < 0):
+            index = 0
+
+        self.__buckets[index] += 1
+        self.__count += 1
+        self.__total += value
+        if (value < self.__min):
+            self.__min = value
+        if (value > self.__max):
+            self.__max = value
+
+    def merge(self, other):
+        """ Add the values of a histogram with the same buckets. """
+        if (other.__resolution != self.__resolution or other.__size != self.__size):
+            raise ValueError('Histograms have different buckets')
+
+        for index, count in enumerate(other.__buckets):
+            self.__buckets[index] += count
+        self.__count += other.__count
+        self.__total += other.__total
+        self.__min = min(self.__min, other.__min)
+        self.__max = max(self.__max, other.__max)
+
+    def getCount(self) -> int:
+        return self.__count
+
+    def getMin(self) -> float:
+        return self.__min if self.__count else 0.0
+
+    def getMax(self) -> float:
+        return self.__max if self.__count else 0.0
+
+    def getMean(self) -> float:
+        return self.__total / self.__count if self.__count else 0.0
+
+    def percentile(self, percent) -> float:
+        """ Get a percentile, interpolated linearly within its bucket.
+
+        The bucket bounds are narrowed to the recorded min and max, so a
+        distribution narrower than one bucket is not reported at its upper
+        bound. Percentiles 0 and 100 are the min and the max, others are
+        clamped between them.
+
+        Parameters
+        ----------
+        percent : float
+            Percentile between 0 and 100.
+        """
+        if (self.__count == 0):
+            return 0.0
+        elif (percent <= 0):
+            return self.__min
+        elif (percent >= 100):
+            return self.__max
+
+        rank = math.ceil(self.__count * percent / 100)
+        seen = 0
+        for index, count in enumerate(self.__buckets):
+            if (count > 0 and seen + count >= rank):
+                lower = max(index * self.__resolution, self.__min)
+                if (index == self.__size):
+                    upper = self.__max
+                else:
+                    upper = min((index + 1) * self.__resolution, self.__max)
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(max(value, self.__min), self.__max)
+            seen += count
+
+        return self.__max
+
+    def getBuckets(self) -> dict:
+        """ Get non-empty buckets indexed by their lower bound. """
+        return {round(index * self.__resolution, 9): count
+                for index, count in enumerate(self.__buckets) if count > 0}
+
+    def toDict(self) -> dict:
+        return {
+            "count": self.getCount(),
+            "min": self.getMin(),
+            "max": self.getMax(),
+            "mean": self.getMean(),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
@@ -4,15 +4,18 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
+from openwinch.config import config
 from openwinch.logger import logger
-from openwinch.constantes import (MOTOR_MAX, LOOP_DELAY)
-from openwinch.utils import rotate2distance
+from openwinch.constantes import (MOTOR_MAX, WINCH_DISTANCE)
+from openwinch.metrics import Histogram
+from openwinch.scheduler import (LoopScheduler, OverrunPolicy)
+from openwinch.state import State
+from openwinch.utils import (distance2rotate, rotate2distance)
 
 from enum import Enum, unique
 from abc import ABC, abstractmethod
 
 import threading
-import time
 
 
 @unique
@@ -26,6 +29,27 @@ class ModeType(Enum):
         return list(ModeType)
 
 
+class TickSnapshot(object):
+    """ Immutable view of the winch captured once at the start of a control tick. """
+
+    __slots__ = ('state', 'speed_target', 'rotation', 'throttle')
+
+    def __init__(self, state, speed_target, rotation, throttle):
+        object.__setattr__(self, 'state', state)
+        object.__setattr__(self, 'speed_target', speed_target)
+        object.__setattr__(self, 'rotation', rotation)
+        object.__setattr__(self, 'throttle', throttle)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TickSnapshot is read-only")
+
+    def __repr__(self):
+        return "state : %s - target : %s - rotation : %s - throttle : %s" % (self.state,
+                                                                           self.speed_target,
+                                                                           self.rotation,
+                                                                           self.throttle)
+
+
 class ModeEngine(ABC):
 
     __security_begin = 20
@@ -35,31 +59,49 @@ class ModeEngine(ABC):
 
     _board = None
     _winch = None
+    _scheduler = None
     _speed_current = 0
+    _throttle_current = 0
+
+    __thread = None
+    __command = None
+    __halted = False
 
     def __init__(self, winch, board):
         self._winch = winch
         self._board = board
+        self.__clock = winch.getClock()
+        self._scheduler = LoopScheduler(config.LOOP_RATE, OverrunPolicy[config.LOOP_POLICY], clock=self.__clock)
         self.__speed_ratio = 1 / MOTOR_MAX
+        self.__latency = {}
+        self.__board_lock = threading.RLock()
 
     def __initialize(self):
-        logger.debug("Initialize mode.")
-        self._speed_current = 0
-        self._board.initialize()
+        with self.__board_lock:
+            if (self.__halted):
+                # Emergency received after the snapshot of this tick.
+                return
+
+            logger.debug("Initialize mode.")
+            self._speed_current = 0
+            # Applied on return, also through a BoardPipeline.
+            self._board.initialize()
         self._winch.initialized()
 
-    def __starting(self):
+    def __starting(self, snapshot):
+        speed_target = snapshot.speed_target
+
         # Increment speed
-        if (self._speed_current < self._winch.getSpeedTarget()):
+        if (self._speed_current < speed_target):
             self._speed_current += self.__velocity_start
 
-            if (self._speed_current >= self._winch.getSpeedTarget()):
+            if (self._speed_current >= speed_target):
                 self._winch.started()
 
         # Decrement speed
-        if (self._speed_current > self._winch.getSpeedTarget()):
+        if (self._speed_current > speed_target):
             vel_stop = self.__velocity_stop
-            diff_stop = self._speed_current - self._winch.getSpeedTarget()
+            diff_stop = self._speed_current - speed_target
 
             if (vel_stop > diff_stop):
                 vel_stop = diff_stop
@@ -69,7 +111,7 @@ class ModeEngine(ABC):
             else:
                 self._speed_current = 0
 
-    def __stopping(self):
+    def __stopping(self, snapshot):
         if (self._speed_current > 0):
             vel_stop = self.__velocity_stop
             diff_stop = self._speed_current - 0
@@ -83,25 +125,89 @@ class ModeEngine(ABC):
                 self._speed_current = 0
                 self._winch.stopped()
 
-        elif (self._speed_current < 0):
+        else:
             self._speed_current = 0
             self._winch.stopped()
 
     def __fault(self):
-        self._board.emergency()
+        with self.__board_lock:
+            if (not self.__halted):
+                self.__halted = True
+                self._board.emergency()
         self._speed_current = 0
 
+    def emergency(self):
+        """ Cut the power and the throttle on the calling thread.
+
+        The control loop is not involved : the board is driven under the board
+        lock, so the time spent here is bounded by the tick currently writing
+        to the board (if any). The loop reconciles on its next tick.
+        """
+        begin = self.__clock()
+        with self.__board_lock:
+            self.__halted = True
+            # Also sets the throttle to 0, not queued by a BoardPipeline.
+            self._board.emergency()
+            self._throttle_current = 0
+            self._speed_current = 0
+        self.__record(State.ERROR, self.__clock() - begin)
+
     @abstractmethod
-    def _extraMode(self):
+    def _extraMode(self, snapshot):
         pass
 
-    def _isBeginSecurity(self) -> bool:
-        return (self._board.getRotationFromBegin() - self.__security_begin <= 0)
+    def _isBeginSecurity(self, snapshot) -> bool:
+        return (snapshot.rotation - self.__security_begin <= 0)
+
+    def notify(self, state):
+        """ Wake up the control loop after a state change.
+
+        Parameters
+        ----------
+        state : State Enum
+            New state of the winch.
+        """
+        if (threading.current_thread() is not self.__thread):
+            if (state.isInit):
+                self.__halted = False
+
+            if (not (state.isFault and self.__halted)):
+                # Latency of the emergency fast-path is already recorded.
+                self.__command = (state, self.__clock())
+            self._scheduler.wakeup()
+
+    def __record(self, state, latency):
+        if (state not in self.__latency):
+            self.__latency[state] = Histogram(resolution=0.0001, size=1000)
+        self.__latency[state].record(latency)
+
+    def __actuated(self, state):
+        """ Record latency between a command and its application on board. """
+        command = self.__command
+        if (command is not None and command[0] == state):
+            self.__command = None
+            self.__record(state, self.__clock() - command[1])
+
+    def getLatencyStats(self) -> dict:
+        """ Get command-to-actuation latency (in seconds) per state. """
+        return {state.name: histogram.toDict() for state, histogram in list(self.__latency.items())}
+
+    def captureSnapshot(self) -> TickSnapshot:
+        """ Read winch and board inputs for the current tick. """
+        return TickSnapshot(self._winch.getState(),
+                            self._winch.getSpeedTarget(),
+                            self._board.getRotationFromBegin(),
+                            self._throttle_current)
+
+    def applyThrottleValue(self, snapshot):
+        with self.__board_lock:
+            if (snapshot.state.isFault or self.__halted):
+                value = 0
+            else:
+                value = self.__speed_ratio * self._speed_current
 
-    def applyThrottleValue(self):
-        logger.debug("Calculate & apply throttle value.")
-        value = self.__speed_ratio * self._speed_current
-        self._board.setThrottleValue(value)
+            self._board.setThrottleValue(value)
+            self._throttle_current = value
 
     # Move to Board or Winch
     def getDistance(self) -> float:
@@ -111,77 +217,125 @@ class ModeEngine(ABC):
     def getSpeedCurrent(self) -> int:
         return self._speed_current
 
-    def runControlLoop(self):
-        """ Main Loop to control hardware. """
+    def getAccelerationStart(self) -> float:
+        """ Get speed increase per second while starting. """
+        return self.__velocity_start * self._scheduler.getRate()
 
-        t = threading.currentThread()
-        logger.debug("Starting Control Loop.")
+    def getAccelerationStop(self) -> float:
+        """ Get speed decrease per second while stopping. """
+        return self.__velocity_stop * self._scheduler.getRate()
 
-        while getattr(t, "do_run", True):
-            logger.debug("Current state : %s - speed : %s - limit : %s" % (self._winch.getState(),
-                                                                           self._speed_current,
-                                                                           self._board.getRotationFromBegin()))
+    def getLoopStats(self) -> dict:
+        """ Get timing statistics of the control loop. """
+        return self._scheduler.getStats()
+
+    def resetLoopStats(self):
+        self._scheduler.reset()
+
+    def tick(self, woken=False):
+        """ One iteration of the control loop.
 
-            # INIT
-            if (self._winch.getState().isInit):
-                self.__initialize()
+        Parameters
+        ----------
+        woken : bool, optional
+            Tick started early by a command (default is False). Only the board
+            initialization and the fault are applied : speed ramps and the
+            throttle move on scheduled ticks, so their slope does not depend
+            on how often commands arrive.
+        """
 
+        snapshot = self.captureSnapshot()
+        state = snapshot.state
+        logger.debug("Tick %s - speed : %s", snapshot, self._speed_current)
+
+        # INIT
+        if (state.isInit):
+            self.__initialize()
+
+        if (not woken):
             # STARTING or RUNNING
-            if (self._winch.getState().isRun):
-                self.__starting()
+            if (state.isRun):
+                self.__starting(snapshot)
 
             # STOP
-            if (self._winch.getState().isStop):
-                self.__stopping()
+            if (state.isStop):
+                self.__stopping(snapshot)
 
             # Specifical mode
-            self._extraMode()
+            self._extraMode(snapshot)
+
+        # EMERGENCY
+        if (state.isFault):
+            self.__fault()
+
+        if (woken and not (state.isInit or state.isFault)):
+            return
 
-            # EMERGENCY
-            if (self._winch.getState().isFault):
-                self.__fault()
+        self.applyThrottleValue(snapshot)
+        self.__actuated(state)
 
-            self.applyThrottleValue()
+    def runControlLoop(self):
+        """ Main Loop to control hardware. """
+
+        t = threading.current_thread()
+        self.__thread = t
+        logger.debug("Starting Control Loop at %s Hz." % self._scheduler.getRate())
+
+        self._scheduler.start()
+        woken = False
+        while getattr(t, "do_run", True):
+            self.tick(woken)
 
-            # CPU idle
-            time.sleep(LOOP_DELAY)
+            # Wait next tick
+            woken = self._scheduler.wait()
 
         logger.debug("Stopping Control Loop.")
 
 
 class OneWayMode(ModeEngine):
 
-    def _extraMode(self):
-        if (self._winch.getState().isRun and self._isBeginSecurity()):  # Limit position START
+    def _extraMode(self, snapshot):
+        if (snapshot.state.isRun and self._isBeginSecurity(snapshot)):  # Limit position START
             self._winch.stop()
 
 
 class TwoWayMode(ModeEngine):
+    """ Go back and forth between both ends of the rope.
+
+    On entering the security zone of an end, the motor stands by for a few
+    ticks then drives the rope to the other end.
+    """
 
     __security_end = 20
     __standby_duration = 5
     __current_duration = 0
+    __zone = None
 
-    def _isEndSecurity(self):
-        return (self._board.getRotationFromInit() >= self._board.getRotationFromExtend() - self.__security_end)
+    def _isEndSecurity(self, snapshot) -> bool:
+        return (snapshot.rotation >= distance2rotate(WINCH_DISTANCE) - self.__security_end)
 
-    def _extraMode(self):
-        if (self._winch.getState().isRun and self._isBeginSecurity()):  # Limit Position BEGIN
-            self._board.setReverse(True)
+    def __enter(self, zone, reverse):
+        if (self.__zone != zone):
+            self.__zone = zone
+            self._board.setReverse(reverse)
             self.__current_duration = self.__standby_duration
 
-        if (self._winch.getState().isRun and self._isEndSecurity()):  # Limit Position END
-            self._board.setReverse(False)
-            self.__current_duration = self.__standby_duration
+    def _extraMode(self, snapshot):
+        if (snapshot.state.isRun and self._isBeginSecurity(snapshot)):  # Limit Position BEGIN
+            self.__enter("begin", True)
+        elif (snapshot.state.isRun and self._isEndSecurity(snapshot)):  # Limit Position END
+            self.__enter("end", False)
+        else:
+            self.__zone = None
 
-        if (self.__current_duration >= 0):
+        if (self.__current_duration > 0):
             self.__current_duration -= 1
             self._speed_current = 0
 
 
 class InfinityMode(ModeEngine):
 
-    def _extraMode(self):
+    def _extraMode(self, snapshot):
         pass
 
 
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+import time
+
+
+class ShadowOutput(object):
+    """ Output device with its last commanded value kept in Python.
+
+    Writes of the value already on the pin are skipped, without reading the
+    device back. PWM values can be quantized to the hardware resolution, so
+    changes smaller than one step are skipped too.
+
+    Relays can be protected with a minimum interval between two toggles : a
+    change requested too early is kept pending and applied by `flush()` once
+    the interval has elapsed (or dropped if the value comes back).
+
+    Parameters
+    ----------
+    device : gpiozero.OutputDevice
+        Device to drive (through its `value` property).
+    resolution : int, optional
+        PWM steps between 0 and 1, None to keep values as is (default is None)
+    min_toggle : float, optional
+        Minimum delay between two changes in seconds (default is 0)
+    clock : callable, optional
+        Monotonic clock in seconds (default is time.monotonic)
+    """
+
+    def __init__(self, device, resolution=None, min_toggle=0, clock=time.monotonic):
+        self.__device = device
+        self.__resolution = resolution
+        self.__min_toggle = min_toggle
+        self.__clock = clock
+
+        self.__value = None
+        self.__pending = None
+        self.__changed_at = None
+
+        self.__requested = 0
+        self.__written = 0
+        self.__deferred = 0
+
+    def __apply(self, value):
+        self.__device.value = value
+        self.__value = value
+        self.__pending = None
+        self.__changed_at = self.__clock()
+        self.__written += 1
+
+    def write(self, value, force=False) -> bool:
+        """ Command a new value.
+
+        Parameters
+        ----------
+        value : bool or float
+            Value of the output.
+        force : bool, optional
+            Write now, even when the value is already set or the relay
+            toggled recently (default is False)
+
+        Returns
+        -------
+        bool
+            True when the device was written.
+        """
+        self.__requested += 1
+        if (self.__resolution is not None):
+            value = round(value * self.__resolution) / self.__resolution
+
+        if (force):
+            self.__apply(value)
+            return True
+
+        if (value == self.__value):
+            self.__pending = None
+            return False
+
+        if (self.__min_toggle > 0 and self.__changed_at is not None
+                and self.__clock() - self.__changed_at < self.__min_toggle):
+            self.__pending = value
+            self.__deferred += 1
+            return False
+
+        self.__apply(value)
+        return True
+
+    def flush(self) -> bool:
+        """ Apply a deferred change when the toggle interval has elapsed. """
+        if (self.__pending is not None and self.__clock() - self.__changed_at >= self.__min_toggle):
+            self.__apply(self.__pending)
+            return True
+
+        return False
+
+    def getValue(self):
+        """ Get the last value written. """
+        return self.__value
+
+    def isPending(self) -> bool:
+        """ Check if a change is deferred by the toggle interval. """
+        return self.__pending is not None
+
+    def getStats(self) -> dict:
+        """ Get write counters. """
+        return {
+            "requested": self.__requested,
+            "written": self.__written,
+            "skipped": self.__requested - self.__written,
+            "deferred": self.__deferred,
+        }
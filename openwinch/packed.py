@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Framebuffer in the SH1106 page layout (requires numpy).
+
+The frame is a (pages, width) array of bytes : one byte per column of a page
+of 8 pixels high, least significant bit on top. Rectangles are built as page
+bit masks and applied to column slices, so a fill costs one NumPy operation
+per frame whatever its size, and the pages go to the device as they are.
+"""
+
+from PIL import (Image, ImageColor)
+
+import math
+
+import numpy as np
+
+
+class PackedFrame(object):
+    """ 1-bit frame stored as SH1106 pages.
+
+    Parameters
+    ----------
+    size : tuple
+        (width, height), height multiple of 8.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.width, self.height = size
+        self.mode = '1'
+        self.__pages = np.zeros((self.height // 8, self.width), dtype=np.uint8)
+        self.__tiles = {}
+
+    def __masks(self, top, bottom) -> np.ndarray:
+        """ Page bit masks of rows from top to bottom (included). """
+        rows = np.zeros(self.height, dtype=bool)
+        rows[max(top, 0):max(bottom + 1, 0)] = True
+        return np.packbits(rows.reshape(-1, 8), axis=1, bitorder='little')
+
+    def fill(self, box, value):
+        """ Fill a box (x0, y0, x1, y1), bounds included. """
+        x0, y0, x1, y1 = box
+        if (x1 < 0 or y1 < 0 or x0 >= self.width or y0 >= self.height):
+            return
+
+        columns = slice(max(x0, 0), x1 + 1)
+        masks = self.__masks(y0, y1)
+        if (value):
+            self.__pages[:, columns] |= masks
+        else:
+            self.__pages[:, columns] &= ~masks
+
+    def __packTile(self, tile, y) -> tuple:
+        """ Pack a tile on the pages of rows y to y + tile height. """
+        entry = self.__tiles.get((id(tile), y))
+        if (entry is None or entry[0] is not tile):
+            top = max(y, 0)
+            bottom = min(y + tile.height, self.height)
+            rows = np.zeros((self.height, tile.width), dtype=bool)
+            if (top < bottom):
+                pixels = np.array(tile, dtype=bool)
+                rows[top:bottom] = pixels[top - y:bottom - y]
+            ink = np.packbits(rows.reshape(-1, 8, tile.width), axis=1, bitorder='little').reshape(-1, tile.width)
+            entry = (tile, ink, self.__masks(top, bottom - 1))
+            self.__tiles[(id(tile), y)] = entry
+
+        return entry
+
+    def __columns(self, x, width) -> tuple:
+        """ Frame and tile column slices of a tile at x, clipped. """
+        left = max(x, 0)
+        right = min(x + width, self.width)
+        return (slice(left, right), slice(left - x, right - x))
+
+    def paste(self, tile, xy):
+        """ Paste like `Image.paste()` : a 1-bit tile at (x, y), or a value on a box. """
+        if (not isinstance(tile, Image.Image)):
+            self.fill((xy[0], xy[1], xy[2] - 1, xy[3] - 1), tile)
+            return
+
+        x, y = xy
+        target, source = self.__columns(x, tile.width)
+        if (target.start >= target.stop):
+            return
+
+        _, ink, masks = self.__packTile(tile, y)
+        pages = self.__pages[:, target]
+        pages &= ~masks
+        pages |= ink[:, source]
+
+    def draw(self, tile, xy, value):
+        """ Set the pixels of a 1-bit mask tile at (x, y) to a value. """
+        x, y = xy
+        target, source = self.__columns(x, tile.width)
+        if (target.start >= target.stop):
+            return
+
+        _, ink, _ = self.__packTile(tile, y)
+        if (value):
+            self.__pages[:, target] |= ink[:, source]
+        else:
+            self.__pages[:, target] &= ~ink[:, source]
+
+    def getPages(self) -> np.ndarray:
+        return self.__pages
+
+    def toPages(self) -> list:
+        """ Get pages as `bytes`, like `framebuffer.toPages()`. """
+        return [page.tobytes() for page in self.__pages]
+
+    def toImage(self) -> Image.Image:
+        rows = np.unpackbits(self.__pages[:, None, :], axis=1, bitorder='little').reshape(self.height, self.width)
+        return Image.fromarray(rows.astype(bool))
+
+    def tobytes(self) -> bytes:
+        """ Get pixels in the `Image.tobytes()` layout of a 1-bit image. """
+        return self.toImage().tobytes()
+
+
+class PackedDraw(object):
+    """ `ImageDraw` subset used by the screens, drawing on a `PackedFrame`.
+
+    Texts are drawn from glyph tiles of the sprite cache.
+
+    Parameters
+    ----------
+    frame : PackedFrame
+        Frame to draw on.
+    sprites : SpriteCache
+        Cache rasterizing the texts.
+    """
+
+    def __init__(self, frame, sprites):
+        self.__frame = frame
+        self.__sprites = sprites
+
+    @staticmethod
+    def __ink(color) -> int:
+        if (isinstance(color, str)):
+            color = ImageColor.getcolor(color, '1')
+        return 1 if color else 0
+
+    def rectangle(self, xy, fill=None, outline=None):
+        if (len(xy) == 2):
+            xy = (xy[0][0], xy[0][1], xy[1][0], xy[1][1])
+        x0, y0, x1, y1 = [int(value) for value in xy]
+        if (x1 < x0 or y1 < y0):
+            raise ValueError("x1 must be >= x0 and y1 must be >= y0")
+
+        if (fill is not None):
+            self.__frame.fill((x0, y0, x1, y1), self.__ink(fill))
+
+        if (outline is not None and outline != fill):
+            ink = self.__ink(outline)
+            self.__frame.fill((x0, y0, x1, y0), ink)
+            self.__frame.fill((x0, y1, x1, y1), ink)
+            self.__frame.fill((x0, y0, x0, y1), ink)
+            self.__frame.fill((x1, y0, x1, y1), ink)
+
+    def text(self, xy, text, fill=None, font=None):
+        start = (math.modf(xy[0])[0], math.modf(xy[1])[0])
+        tile, offset = self.__sprites.get(text, font.path, font.size, False, start)
+        if (tile is not None):
+            self.__frame.draw(tile, (int(xy[0]) + offset[0], int(xy[1]) + offset[1]), self.__ink(fill))
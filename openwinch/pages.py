@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Template values and cache of the HTML pages, shared by the web servers. """
+
+from openwinch.constantes import SPEED_UNIT
+from openwinch.state import State
+
+import gzip
+import threading
+
+# Battery percents rendered by the same cached page.
+PAGE_BATTERY_STEP = 5
+
+
+def stateColor(state) -> str:
+    """ Get the color of the speed for a winch state. """
+    if (state.isRun):
+        return "lime"
+    elif (state == State.ERROR):
+        return "red"
+    elif (state == State.UNKNOWN or state == State.INIT):
+        return "orange"
+    return "white"
+
+
+def mainContext(winch) -> dict:
+    """ Get the values of `index.html`. """
+    return {
+        "mode": winch.getMode(),
+        "battery": winch.getBattery(),
+        "speed_target": winch.getSpeedTarget(),
+        "speed_unit": SPEED_UNIT,
+        "enable": stateColor(winch.getState()),
+    }
+
+
+def extraContext(winch) -> dict:
+    """ Get the values of `extra.html`. """
+    return {
+        "mode": winch.getMode(),
+        "battery": winch.getBattery(),
+        "speed_target": winch.getSpeedTarget(),
+        "speed_unit": SPEED_UNIT,
+        "enable": "white",
+    }
+
+
+class Page(object):
+    """ Rendered HTML page, with its gzip encoding. """
+
+    def __init__(self, html):
+        self.body = html.encode()
+        self.gzip = gzip.compress(self.body, mtime=0)
+
+
+class PageCache(object):
+    """ Rendered pages of a winch, one per view.
+
+    A page is rendered again when the winch version changes (state or speed
+    target) or when the battery leaves its `battery_step` bucket. Requests
+    arriving while a page is rendered wait for that render instead of
+    rendering it again.
+
+    Parameters
+    ----------
+    winch : Winch
+        Winch shown by the pages.
+    battery_step : int, optional
+        Battery percents of a bucket (default is PAGE_BATTERY_STEP)
+    """
+
+    def __init__(self, winch, battery_step=PAGE_BATTERY_STEP):
+        self.__winch = winch
+        self.__battery_step = battery_step
+        self.__lock = threading.Lock()
+        self.__pages = {}
+        self.__renders = {}
+
+        self.__hits = 0
+        self.__misses = 0
+        self.__shared = 0
+
+    def getKey(self) -> tuple:
+        return (self.__winch.getVersion(), self.__winch.getBattery() // self.__battery_step)
+
+    def get(self, view, render) -> Page:
+        """ Get the page of a view, rendered by `render()` (HTML) when outdated. """
+        key = self.getKey()
+        with self.__lock:
+            entry = self.__pages.get(view)
+            if (entry is not None and entry[0] == key):
+                self.__hits += 1
+                return entry[1]
+
+            pending = self.__renders.get((view, key))
+            leader = pending is None
+            if (leader):
+                pending = [threading.Event(), None]
+                self.__renders[(view, key)] = pending
+                self.__misses += 1
+            else:
+                self.__shared += 1
+
+        if (not leader):
+            pending[0].wait()
+            if (pending[1] is not None):
+                return pending[1]
+            # Render failed : render without cache.
+            return Page(render())
+
+        try:
+            page = Page(render())
+            pending[1] = page
+            with self.__lock:
+                self.__pages[view] = (key, page)
+            return page
+        finally:
+            with self.__lock:
+                del self.__renders[(view, key)]
+            pending[0].set()
+
+    def clear(self):
+        with self.__lock:
+            self.__pages.clear()
+
+    def getStats(self) -> dict:
+        """ Get pages served from cache, rendered, and shared with a pending render. """
+        return {
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "shared": self.__shared,
+        }
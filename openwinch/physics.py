@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.constantes import (SPEED_MAX, WINCH_DIAM, WINCH_DISTANCE)
+from openwinch.utils import distance2rotate
+
+import math
+
+
+class DrumModel(object):
+    """ Time-stepped model of the drum, its motor and the towed load.
+
+    Angular speed is positive when the drum winds the rope in. Rotation is
+    counted in turns of rope unwound, like `Board.getRotationFromBegin()`.
+
+    - Motor : DC motor driven by the throttle (0..1), torque falls linearly
+      with speed up to the no-load speed. It coasts at zero throttle and when
+      the power is off. Reverse drives the drum to unwind.
+    - Load : constant pull of the towed load plus aerodynamic drag while
+      winding in. While the rope is pulled out the puller cannot go faster
+      than `pull_speed`.
+    - Drum : inertia with viscous and dry friction. It stops when the rope
+      is fully unwound.
+
+    Parameters
+    ----------
+    inertia : float, optional
+        Drum and motor inertia in kg.m² (default is 0.3)
+    stall_torque : float, optional
+        Motor torque at full throttle and zero speed in N.m (default is 200)
+    no_load_speed : float, optional
+        Rope speed at full throttle without load in Km/h (default is SPEED_MAX)
+    load : float, optional
+        Pull of the towed load in N (default is 150)
+    drag : float, optional
+        Drag coefficient of the towed load in N/(m/s)² (default is 2)
+    pull_speed : float, optional
+        Maximum speed of the load pulling the rope out in m/s (default is 2)
+    viscous : float, optional
+        Viscous friction in N.m.s/rad (default is 0.05)
+    friction : float, optional
+        Dry friction in N.m (default is 1)
+    rope_length : float, optional
+        Rope length in meter (default is WINCH_DISTANCE)
+    max_step : float, optional
+        Integration step in seconds (default is 1 ms)
+    max_substeps : int, optional
+        Maximum steps per `step()` call, longer durations use longer steps
+        (default is 1000)
+    """
+
+    def __init__(self,
+                 inertia=0.3,
+                 stall_torque=200,
+                 no_load_speed=SPEED_MAX,
+                 load=150,
+                 drag=2,
+                 pull_speed=2,
+                 viscous=0.05,
+                 friction=1,
+                 rope_length=WINCH_DISTANCE,
+                 max_step=0.001,
+                 max_substeps=1000):
+        self.__radius = WINCH_DIAM / 2
+        self.__inertia = inertia
+        self.__stall_torque = stall_torque
+        self.__no_load_omega = no_load_speed / 3.6 / self.__radius
+        self.__load = load
+        self.__drag = drag
+        self.__pull_speed = pull_speed
+        self.__viscous = viscous
+        self.__friction = friction
+        self.__rope_turns = distance2rotate(rope_length)
+        self.__max_step = max_step
+        self.__max_substeps = max_substeps
+
+        self.__power = False
+        self.__reverse = False
+        self.__throttle = 0.0
+        self.__omega = 0.0
+        self.__rotation = 0.0
+
+    def setPower(self, enable):
+        self.__power = enable
+
+    def setReverse(self, enable):
+        self.__reverse = enable
+
+    def setThrottle(self, value):
+        self.__throttle = min(max(value, 0.0), 1.0)
+
+    def setRotation(self, rotation):
+        self.__rotation = rotation
+
+    def getRotation(self) -> float:
+        """ Get turns of rope unwound. """
+        return self.__rotation
+
+    def getRopeSpeed(self) -> float:
+        """ Get rope speed in m/s (positive when winding in). """
+        return self.__omega * self.__radius
+
+    def getTension(self) -> float:
+        """ Get rope tension in N. """
+        speed = self.getRopeSpeed()
+        if (speed >= 0):
+            return self.__load + self.__drag * speed * speed
+
+        return self.__load * max(0.0, 1 + speed / self.__pull_speed)
+
+    def getMotorTorque(self) -> float:
+        if (not self.__power or self.__throttle <= 0):
+            return 0.0
+
+        throttle = -self.__throttle if self.__reverse else self.__throttle
+        return self.__stall_torque * (throttle - self.__omega / self.__no_load_omega)
+
+    def step(self, duration):
+        """ Integrate the model over a duration in seconds. """
+        if (duration <= 0):
+            return
+
+        count = min(math.ceil(duration / self.__max_step), self.__max_substeps)
+        dt = duration / count
+        for _ in range(count):
+            torque = self.getMotorTorque() - self.getTension() * self.__radius - self.__viscous * self.__omega
+            if (self.__omega != 0):
+                torque -= math.copysign(self.__friction, self.__omega)
+            elif (abs(torque) <= self.__friction or (torque < 0 and self.__rotation >= self.__rope_turns)):
+                # At rest until an input changes.
+                break
+            else:
+                torque -= math.copysign(self.__friction, torque)
+
+            omega = self.__omega + torque / self.__inertia * dt
+            if (self.__omega != 0 and math.copysign(1, omega) != math.copysign(1, self.__omega)):
+                # Dry friction stops the drum, it does not reverse it.
+                omega = 0.0
+
+            # Semi-implicit Euler : position from the new speed.
+            self.__omega = omega
+            self.__rotation -= omega * dt / (2 * math.pi)
+            if (self.__rotation >= self.__rope_turns and omega < 0):
+                # End of the rope.
+                self.__omega = 0.0
+                self.__rotation = self.__rope_turns
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.logger import logger
+from openwinch.metrics import Histogram
+
+from collections import deque
+
+import threading
+import time
+
+
+class BoardPipeline(object):
+    """ Board proxy applying output commands on a dedicated I/O thread.
+
+    Setters only queue a command, so a slow GPIO/I2C write (or its logging)
+    does not stretch the control tick. Commands are applied in order.
+    Throttle values are coalesced while the last queued command is a throttle
+    : the I/O thread applies the newest value, stale ones are dropped.
+    `initialize()` waits until the board has applied it.
+
+    `emergency()` jumps the queue : pending commands are discarded and the
+    board cuts the power and the throttle on the calling thread, waiting at
+    most for the command being applied.
+
+    Getters and other attributes are read from the board.
+
+    Parameters
+    ----------
+    board : Board
+        Board to drive.
+    size : int, optional
+        Maximum queued commands, a full queue blocks the caller (default is 64)
+    clock : callable, optional
+        Monotonic clock in seconds (default is time.monotonic)
+    """
+
+    __THROTTLE = 'setThrottleValue'
+
+    def __init__(self, board, size=64, clock=time.monotonic):
+        self.__board = board
+        self.__size = size
+        self.__clock = clock
+
+        self.__queue = deque()
+        self.__sequence = 0
+        self.__applied_sequence = 0
+        self.__condition = threading.Condition()
+        self.__io_lock = threading.Lock()
+        self.__thread = None
+        self.__running = False
+        self.__epoch = 0
+
+        self.__applied = 0
+        self.__coalesced = 0
+        self.__depth_max = 0
+        self.__latency = Histogram(resolution=0.0001, size=1000)
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined here : board reads.
+        return getattr(self.__board, name)
+
+    def __push(self, name, args) -> tuple:
+        """ Queue a command, get its (sequence, epoch). """
+        with self.__condition:
+            while (len(self.__queue) >= self.__size):
+                self.__condition.wait()
+
+            self.__sequence += 1
+            self.__queue.append((name, args, self.__clock(), self.__sequence))
+            self.__depth_max = max(self.__depth_max, len(self.__queue))
+            self.__condition.notify_all()
+            return (self.__sequence, self.__epoch)
+
+    def __pop(self, block):
+        """ Pop the next command as ((name, args, timestamp, sequence), epoch), None if empty. """
+        with self.__condition:
+            while (block and self.__running and not self.__queue):
+                self.__condition.wait()
+
+            if (not self.__queue):
+                return None
+
+            command = self.__queue.popleft()
+            self.__condition.notify_all()
+            return (command, self.__epoch)
+
+    def __apply(self, command):
+        name, args, timestamp, sequence = command
+        getattr(self.__board, name)(*args)
+        self.__applied += 1
+        self.__latency.record(self.__clock() - timestamp)
+
+        with self.__condition:
+            self.__applied_sequence = sequence
+            self.__condition.notify_all()
+
+    def __run(self):
+        while (self.__running):
+            popped = self.__pop(True)
+            if (popped is not None):
+                with self.__io_lock:
+                    # Skip a command popped before an emergency.
+                    if (popped[1] == self.__epoch):
+                        self.__apply(popped[0])
+
+    def start(self):
+        """ Start the I/O thread. """
+        if (self.__thread is None):
+            self.__running = True
+            self.__thread = threading.Thread(target=self.__run, name="BoardIO", args=(), daemon=True)
+            self.__thread.start()
+
+    def stop(self):
+        """ Stop the I/O thread, pending commands are kept. """
+        with self.__condition:
+            self.__running = False
+            self.__condition.notify_all()
+
+        if (self.__thread is not None):
+            self.__thread.join()
+            self.__thread = None
+
+    def drain(self):
+        """ Apply pending commands on the calling thread. """
+        with self.__io_lock:
+            popped = self.__pop(False)
+            while (popped is not None):
+                self.__apply(popped[0])
+                popped = self.__pop(False)
+
+    def initialize(self):
+        """ Initialize the board, return once it is applied.
+
+        The caller reports the winch initialized after this call. Without the
+        I/O thread, pending commands are applied on the calling thread.
+        """
+        sequence, epoch = self.__push('initialize', ())
+        if (not self.__running):
+            self.drain()
+            return
+
+        with self.__condition:
+            # An emergency drops the command, a stop leaves it pending.
+            while (self.__applied_sequence < sequence and self.__running and self.__epoch == epoch):
+                self.__condition.wait()
+
+    def setThrottleValue(self, value):
+        with self.__condition:
+            if (self.__queue and self.__queue[-1][0] == self.__THROTTLE):
+                # Newest value in the slot of the last command only : the
+                # order with other commands is kept.
+                name, args, timestamp, sequence = self.__queue[-1]
+                self.__queue[-1] = (name, (value,), timestamp, sequence)
+                self.__coalesced += 1
+            else:
+                self.__push(self.__THROTTLE, (value,))
+
+    def setReverse(self, enable):
+        self.__push('setReverse', (enable,))
+
+    def setSpeedMode(self, speed_mode):
+        self.__push('setSpeedMode', (speed_mode,))
+
+    def emergency(self):
+        with self.__condition:
+            dropped = len(self.__queue)
+            self.__queue.clear()
+            self.__epoch += 1
+            self.__condition.notify_all()
+
+        with self.__io_lock:
+            self.__board.emergency()
+
+        if (dropped > 0):
+            logger.debug("IO : %d pending board commands dropped" % dropped)
+
+    def getPipelineStats(self) -> dict:
+        """ Get queue depth and apply latency (command queued to applied). """
+        return {
+            "depth": len(self.__queue),
+            "depth_max": self.__depth_max,
+            "applied": self.__applied,
+            "coalesced": self.__coalesced,
+            "latency": self.__latency.toDict(),
+        }
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.metrics import Histogram
+
+from enum import Enum, unique
+
+import threading
+import time
+
+
+@unique
+class OverrunPolicy(Enum):
+    """ Behaviour of the scheduler when a tick ends after the next deadline. """
+    CATCH_UP = 0
+    SKIP = 1
+
+
+class LoopScheduler(object):
+    """ Fixed-rate scheduler based on absolute monotonic deadlines.
+
+    Deadlines are computed from the start of the loop (`start + n * period`),
+    so the time spent in a tick does not delay the following ones.
+
+    When a tick overruns :
+    - CATCH_UP runs the missed ticks back-to-back, so the number of ticks per
+      second (and the ramp acceleration) is kept. If more than `max_catch_up`
+      ticks are late, the schedule is realigned on the current time.
+    - SKIP drops the missed ticks and waits for the next deadline.
+
+    `wakeup()` interrupts the wait : an extra tick starts immediately, and
+    `wait()` returns True for it. The schedule of the following ticks is kept,
+    so the number of scheduled ticks per second does not depend on wakeups.
+
+    Parameters
+    ----------
+    rate : float
+        Frequency of the loop in Hz.
+    policy : OverrunPolicy, optional
+        Overrun policy (default is CATCH_UP)
+    max_catch_up : int, optional
+        Maximum late ticks replayed by CATCH_UP (default is 10)
+    clock : callable, optional
+        Monotonic clock in seconds (default is time.monotonic)
+    sleep : callable, optional
+        Sleep function in seconds, returning True when woken up
+        (default waits on the wake-up event)
+    """
+
+    def __init__(self, rate, policy=OverrunPolicy.CATCH_UP, max_catch_up=10, clock=time.monotonic, sleep=None):
+        if (rate <= 0):
+            raise ValueError('Loop rate must be positive : %s' % rate)
+
+        self.__rate = rate
+        self.__period = 1 / rate
+        self.__policy = policy
+        self.__max_catch_up = max_catch_up
+        self.__clock = clock
+        self.__wake = threading.Event()
+        self.__sleep = sleep if sleep is not None else self.__wake.wait
+
+        self.__deadline = None
+        self.__last_start = None
+        self.__behind = False
+        self.__woken = False
+        self.__wakeup_at = None
+        self.__periods = Histogram(resolution=self.__period / 100, size=1000)
+        self.__lateness = Histogram(resolution=self.__period / 100, size=1000)
+        self.__wakeup_delays = Histogram(resolution=self.__period / 100, size=1000)
+        self.reset()
+
+    def reset(self):
+        """ Clear statistics. """
+        self.__periods.reset()
+        self.__lateness.reset()
+        self.__wakeup_delays.reset()
+        self.__ticks = 0
+        self.__overruns = 0
+        self.__skipped = 0
+        self.__wakeups = 0
+
+    def start(self):
+        """ Set the first deadline on the current time. """
+        self.__deadline = self.__clock()
+        self.__last_start = None
+        self.__woken = False
+        self.__begin()
+
+    def __begin(self, woken=False):
+        self.__wake.clear()
+        now = self.__clock()
+        if (woken):
+            if (self.__wakeup_at is not None):
+                self.__wakeup_delays.record(now - self.__wakeup_at)
+        else:
+            # Scheduled ticks only : woken ticks are not on the schedule.
+            self.__lateness.record(now - self.__deadline)
+            if (self.__last_start is not None):
+                self.__periods.record(now - self.__last_start)
+            self.__last_start = now
+        self.__wakeup_at = None
+        self.__ticks += 1
+
+    def wakeup(self):
+        """ Start the next tick without waiting for its deadline. """
+        if (self.__wakeup_at is None):
+            self.__wakeup_at = self.__clock()
+        self.__wake.set()
+
+    def wait(self) -> bool:
+        """ Wait for the deadline of the next tick.
+
+        Returns
+        -------
+        bool
+            True when the tick was started early by `wakeup()`.
+        """
+        if (self.__deadline is None):
+            self.start()
+            return False
+
+        if (not self.__woken):
+            # The deadline of a woken tick is still ahead.
+            self.__deadline += self.__period
+        now = self.__clock()
+        late = now - self.__deadline
+
+        if (late > 0):
+            if (not self.__behind):
+                self.__overruns += 1
+            missed = int(late / self.__period)
+
+            if (self.__policy == OverrunPolicy.SKIP):
+                self.__skipped += missed + 1
+                self.__deadline += (missed + 1) * self.__period
+            elif (missed > self.__max_catch_up):
+                self.__skipped += missed
+                self.__deadline = now
+        self.__behind = (late > 0 and self.__policy == OverrunPolicy.CATCH_UP)
+
+        woken = False
+        delay = self.__deadline - now
+        if (delay > 0 and self.__sleep(delay)):
+            woken = True
+            self.__wakeups += 1
+
+        self.__woken = woken
+        self.__begin(woken)
+        return woken
+
+    def getRate(self) -> float:
+        return self.__rate
+
+    def getPeriod(self) -> float:
+        return self.__period
+
+    def getPolicy(self) -> OverrunPolicy:
+        return self.__policy
+
+    def getOverruns(self) -> int:
+        """ Get how many times the loop fell behind its schedule. """
+        return self.__overruns
+
+    def getStats(self) -> dict:
+        """ Get loop statistics (times in seconds).
+
+        `period` is the time between two scheduled ticks and `lateness` the
+        delay of a scheduled tick after its deadline. `wakeup` is the delay
+        between `wakeup()` and the woken tick.
+        """
+        stats = {
+            "rate": self.__rate,
+            "policy": self.__policy.name,
+            "ticks": self.__ticks,
+            "overruns": self.__overruns,
+            "skipped": self.__skipped,
+            "wakeups": self.__wakeups,
+        }
+        stats["period"] = self.__periods.toDict()
+        stats["lateness"] = self.__lateness.toDict()
+        stats["wakeup"] = self.__wakeup_delays.toDict()
+        stats["histogram"] = self.__periods.getBuckets()
+        return stats
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Web server on one asyncio event loop, without Flask.
+
+Serves the same pages as `web_main` and `web_extra`, the static files and the
+JSON API of `web_api` (state with ETag, commands, event stream). Connections
+are kept alive between requests. Pages are rendered from the same Jinja
+templates.
+"""
+
+from jinja2 import (Environment, FileSystemLoader, select_autoescape)
+from openwinch.constantes import (SPEED_MAX, SPEED_MIN)
+from openwinch.logger import logger
+from openwinch.pages import (PageCache, extraContext, mainContext)
+from openwinch.telemetry import (STREAM_KEEPALIVE, Broadcaster, stateDocument)
+from urllib.parse import (parse_qs, urlsplit)
+
+import asyncio
+import hashlib
+import json
+import mimetypes
+import os
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# Delay of an idle keep-alive connection before it is closed (seconds).
+IDLE_TIMEOUT = 15
+# Maximum size of the request line and headers.
+HEADER_LIMIT = 8192
+
+REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class Request(object):
+    """ HTTP request read by `WebServer`. """
+
+    def __init__(self, method, target, version, headers, body):
+        self.method = method
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+        url = urlsplit(target)
+        self.path = url.path
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+    def quality(self, encoding) -> float:
+        """ Get the quality of a content coding in `Accept-Encoding` (0 when not accepted). """
+        qualities = {}
+        for item in self.headers.get("accept-encoding", "").split(","):
+            name, _, parameters = item.partition(";")
+            name = name.strip().lower()
+            if (name == ""):
+                continue
+
+            quality = 1.0
+            for parameter in parameters.split(";"):
+                key, _, value = parameter.partition("=")
+                if (key.strip().lower() == "q"):
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[name] = quality
+
+        return qualities.get(encoding, qualities.get("*", 0.0))
+
+    def keepAlive(self) -> bool:
+        connection = self.headers.get("connection", "").lower()
+        if (self.version == "HTTP/1.0"):
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def values(self) -> dict:
+        """ Get query and form values, or the JSON object of the body. """
+        content_type = self.headers.get("content-type", "")
+        if (content_type.startswith("application/json")):
+            try:
+                body = json.loads(self.body)
+            except ValueError:
+                return {}
+            return body if isinstance(body, dict) else {}
+
+        values = dict(self.query)
+        if (content_type.startswith("application/x-www-form-urlencoded")):
+            values.update({key: items[-1] for key, items in parse_qs(self.body.decode()).items()})
+        return values
+
+
+class AsyncSubscription(object):
+    """ `Broadcaster` client reading its events on an event loop. """
+
+    def __init__(self, broadcaster, loop):
+        self.__broadcaster = broadcaster
+        self.__loop = loop
+        self.__queue = asyncio.Queue(broadcaster.getQueueSize())
+        self.closed = False
+
+    def __push(self, event):
+        # On the event loop : asyncio.Queue is not thread-safe.
+        if (self.closed):
+            return
+        if (self.__queue.full()):
+            self.__broadcaster.dropped(self)
+            self.close()
+            return
+        self.__queue.put_nowait(event)
+
+    def __wake(self):
+        try:
+            self.__queue.put_nowait(None)
+        except asyncio.QueueFull:
+            # The reader checks `closed` before waiting.
+            pass
+
+    def put(self, event) -> bool:
+        """ Queue an event from the producer thread, False once the client is dropped. """
+        if (self.closed):
+            return False
+        self.__loop.call_soon_threadsafe(self.__push, event)
+        return True
+
+    def close(self):
+        self.closed = True
+        self.__broadcaster.unsubscribe(self)
+        # Wake up the reader.
+        self.__loop.call_soon_threadsafe(self.__wake)
+
+    async def get(self, keepalive=STREAM_KEEPALIVE):
+        """ Get the next event, a keep-alive comment while idle, None when closed. """
+        if (self.closed):
+            return None
+        try:
+            return await asyncio.wait_for(self.__queue.get(), keepalive)
+        except asyncio.TimeoutError:
+            return b":\n\n"
+
+
+class WebServer(object):
+    """ HTTP/1.1 server of a winch on one event loop.
+
+    Parameters
+    ----------
+    winch : Winch
+        Winch driven by the server.
+    stream_rate : float, optional
+        State polls per second of the event stream (default is 5)
+    """
+
+    def __init__(self, winch, stream_rate=5):
+        self.__winch = winch
+        self.__broadcaster = Broadcaster(winch, stream_rate)
+        self.__templates = Environment(loader=FileSystemLoader(os.path.join(BASE_PATH, "templates")),
+                                       autoescape=select_autoescape(['html']))
+        self.__templates.globals["url_for"] = self.__urlFor
+        self.__page_cache = PageCache(winch)
+        self.__server = None
+
+        self.__pages = {
+            "/": None,
+            "/start": winch.start,
+            "/stop": winch.stop,
+            "/up": winch.speedUp,
+            "/down": winch.speedDown,
+            "/halt": winch.emergency,
+        }
+        self.__extra_pages = {
+            "/extra": None,
+            "/reset": winch.initialize,
+            "/left": None,
+            "/right": None,
+        }
+        self.__commands = {
+            "/api/v1/start": winch.start,
+            "/api/v1/stop": winch.stop,
+            "/api/v1/up": winch.speedUp,
+            "/api/v1/down": winch.speedDown,
+            "/api/v1/halt": winch.emergency,
+            "/api/v1/reset": winch.initialize,
+        }
+
+    @staticmethod
+    def __urlFor(endpoint, **values) -> str:
+        if (endpoint == "static"):
+            return "/static/%s" % values["filename"]
+        return {"web_main.index": "/",
+                "web_api.stream": "/api/v1/stream",
+                "web_api.state": "/api/v1/state"}[endpoint]
+
+    def getBroadcaster(self) -> Broadcaster:
+        return self.__broadcaster
+
+    def getPageCache(self) -> PageCache:
+        return self.__page_cache
+
+    async def start(self, host="0.0.0.0", port=5000):
+        self.__server = await asyncio.start_server(self.__connection, host, port, limit=HEADER_LIMIT)
+        return self.__server
+
+    def getPort(self) -> int:
+        return self.__server.sockets[0].getsockname()[1]
+
+    async def serveForever(self, host="0.0.0.0", port=5000):
+        await self.start(host, port)
+        logger.info("Web server on http://%s:%d" % (host, self.getPort()))
+        async with self.__server:
+            await self.__server.serve_forever()
+
+    def run(self, host="0.0.0.0", port=5000):
+        """ Serve until interrupted. """
+        try:
+            asyncio.run(self.serveForever(host, port))
+        except KeyboardInterrupt:
+            pass
+
+    async def __readRequest(self, reader) -> Request:
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        method, target, version = lines[0].split(" ", 2)
+
+        headers = {}
+        for line in lines[1:]:
+            if (":" in line):
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        body = await reader.readexactly(length) if length > 0 else b""
+        return Request(method, target, version, headers, body)
+
+    async def __connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.__readRequest(reader), IDLE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                except ValueError:
+                    self.__write(writer, 400, {}, b"Bad Request", False)
+                    break
+
+                keep_alive = request.keepAlive()
+                if (request.path == "/api/v1/stream"):
+                    await self.__stream(writer)
+                    break
+
+                status, headers, body = self.__dispatch(request)
+                self.__write(writer, status, headers, body, keep_alive)
+                await writer.drain()
+                if (not keep_alive):
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def __write(self, writer, status, headers, body, keep_alive):
+        lines = ["HTTP/1.1 %d %s" % (status, REASONS[status])]
+        headers.setdefault("Content-Type", "text/plain; charset=utf-8")
+        headers["Content-Length"] = str(len(body))
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines += ["%s: %s" % item for item in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+
+    def __dispatch(self, request) -> tuple:
+        """ Get (status, headers, body) of a request. """
+        path = request.path
+        try:
+            if (path in self.__pages or path in self.__extra_pages):
+                return self.__page(request)
+            elif (path == "/api/v1/state"):
+                return self.__state(request)
+            elif (path in self.__commands or path == "/api/v1/speed"):
+                return self.__command(request)
+            elif (path.startswith("/static/")):
+                return self.__static(request)
+        except Exception as e:
+            logger.error("Request %s failed : %s" % (path, e))
+            return (500, {}, b"Internal Server Error")
+
+        return (404, {}, b"Not Found")
+
+    def __page(self, request) -> tuple:
+        if (request.method != "GET"):
+            return (405, {"Allow": "GET"}, b"Method Not Allowed")
+
+        if (request.path in self.__pages):
+            command, template, context = self.__pages[request.path], "index.html", mainContext
+        else:
+            command, template, context = self.__extra_pages[request.path], "extra.html", extraContext
+        if (command is not None):
+            command()
+
+        page = self.__page_cache.get(template, lambda: self.__templates.get_template(template).render(**context(self.__winch)))
+        headers = {"Content-Type": "text/html; charset=utf-8", "Vary": "Accept-Encoding"}
+        if (request.quality("gzip") > 0):
+            headers["Content-Encoding"] = "gzip"
+            return (200, headers, page.gzip)
+        return (200, headers, page.body)
+
+    def __state(self, request) -> tuple:
+        if (request.method != "GET"):
+            return (405, {"Allow": "GET"}, b"Method Not Allowed")
+        return self.__stateResponse(request)
+
+    def __stateResponse(self, request) -> tuple:
+        body = (json.dumps(stateDocument(self.__winch), sort_keys=True, separators=(',', ':')) + "\n").encode()
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        headers = {"Content-Type": "application/json", "ETag": etag}
+        if (etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]):
+            return (304, headers, b"")
+        return (200, headers, body)
+
+    def __command(self, request) -> tuple:
+        if (request.method != "POST"):
+            return (405, {"Allow": "POST"}, b"Method Not Allowed")
+
+        if (request.path == "/api/v1/speed"):
+            try:
+                value = int(request.values().get("value"))
+            except (TypeError, ValueError):
+                return (400, {}, b"value must be an integer")
+            if (not self.__winch.speedValue(value)):
+                return (400, {}, ("value must be between %d and %d" % (SPEED_MIN, SPEED_MAX)).encode())
+        else:
+            self.__commands[request.path]()
+
+        return self.__stateResponse(request)
+
+    def __static(self, request) -> tuple:
+        root = os.path.join(BASE_PATH, "static")
+        path = os.path.abspath(os.path.join(root, request.path[len("/static/"):]))
+        if (not path.startswith(root + os.sep) or not os.path.isfile(path)):
+            return (404, {}, b"Not Found")
+
+        with open(path, "rb") as file:
+            body = file.read()
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        return (200, {"Content-Type": content_type}, body)
+
+    async def __stream(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\n"
+                     b"Connection: close\r\n\r\n")
+        subscription = self.__broadcaster.subscribe(AsyncSubscription(self.__broadcaster, asyncio.get_running_loop()))
+        try:
+            while True:
+                event = await subscription.get()
+                if (event is None):
+                    break
+                writer.write(event)
+                await writer.drain()
+        finally:
+            subscription.close()
+
+
+def serve(winch=None, host="0.0.0.0", port=5000):
+    """ Serve a winch (default is the `openwinch.winch` singleton) until interrupted. """
+    from openwinch.config import config
+
+    if (winch is None):
+        from openwinch.singleton import winch
+
+    WebServer(winch, config.STREAM_RATE).run(host, port)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+from openwinch.config import config
+from openwinch.controller import Winch
+from openwinch.mode import ModeType
+
+
+class VirtualClock(object):
+    """ Clock advanced by hand, usable in place of time.monotonic.
+
+    Parameters
+    ----------
+    start : float, optional
+        Initial time in seconds (default is 0)
+    """
+
+    def __init__(self, start=0.0):
+        self.__now = start
+
+    def __call__(self) -> float:
+        return self.__now
+
+    def advance(self, delay):
+        """ Move the clock forward. """
+        if (delay > 0):
+            self.__now += delay
+
+    sleep = advance
+
+
+class Simulation(object):
+    """ Step a winch on a virtual clock, without threads.
+
+    Each step runs one control tick then advances the clock by one loop
+    period, so a simulation is deterministic and runs as fast as the CPU
+    allows.
+
+    Parameters
+    ----------
+    mode : ModeType, optional
+        Mode of winch (default is OneWay)
+    board : str, optional
+        Board class (default is the Emulator)
+    rate : float, optional
+        Control loop frequency in Hz (default is config.LOOP_RATE)
+    """
+
+    def __init__(self, mode=ModeType.OneWay, board='openwinch.hardware.Emulator', rate=None):
+        self.clock = VirtualClock()
+        self.period = 1 / (rate if rate is not None else config.LOOP_RATE)
+        self.ticks = 0
+        self.winch = Winch(board=board, mode=str(mode), clock=self.clock, threaded=False)
+
+    def step(self, count=1):
+        """ Run some control ticks. """
+        for _ in range(count):
+            self.winch.controlTick()
+            self.clock.advance(self.period)
+            self.ticks += 1
+
+    def runFor(self, duration):
+        """ Run control ticks during a virtual duration in seconds. """
+        self.step(int(round(duration / self.period)))
+
+    def runUntil(self, predicate, timeout=60) -> bool:
+        """ Run control ticks until a condition is true.
+
+        Parameters
+        ----------
+        predicate : callable
+            Condition called with the winch after each tick.
+        timeout : float, optional
+            Maximum virtual duration in seconds (default is 60)
+
+        Returns
+        -------
+        bool
+            False when the timeout expired.
+        """
+        limit = self.clock() + timeout
+        while (not predicate(self.winch)):
+            if (self.clock() >= limit):
+                return False
+            self.step()
+
+        return True
+
+    def getTime(self) -> float:
+        """ Get the virtual time elapsed since the start. """
+        return self.clock()
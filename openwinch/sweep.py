@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Batch simulation of tow profiles (requires numpy).
+
+All parameter sets move through the ramp/stop logic of `ModeEngine` and the
+drum kinematics at once, one NumPy operation per tick for the whole batch.
+"""
+
+from openwinch.constantes import (SPEED_MAX, WINCH_DISTANCE, LOOP_DELAY)
+from openwinch.utils import (distance2rotate, rotate2distance)
+
+import itertools
+
+import numpy as np
+
+# Speed unit (Km/h) to m/s.
+SPEED_TO_MS = 1 / 3.6
+
+
+class ParameterSweep(object):
+    """ Tow profile simulation for arrays of parameter sets.
+
+    Each scenario is a OneWay tow : start from `start_distance`, ramp up to
+    `speed_max`, stop when entering the start security zone
+    (`security_begin` rotations), ramp down to zero. The drum follows the
+    commanded speed (ideal kinematics).
+
+    Parameters are broadcast together, scalar or array-like.
+
+    Parameters
+    ----------
+    security_begin : array_like, optional
+        Start security distance in drum rotations (default is 20)
+    velocity_start : array_like, optional
+        Speed increment per tick (default is 1)
+    velocity_stop : array_like, optional
+        Speed decrement per tick (default is 3)
+    speed_max : array_like, optional
+        Target speed in Km/h (default is SPEED_MAX)
+    loop_delay : array_like, optional
+        Control loop period in seconds (default is LOOP_DELAY)
+    start_distance : array_like, optional
+        Rope length at start in meter (default is WINCH_DISTANCE)
+    """
+
+    __STATE_RUN = 0
+    __STATE_STOP = 1
+    __STATE_IDLE = 2
+
+    def __init__(self,
+                 security_begin=20,
+                 velocity_start=1,
+                 velocity_stop=3,
+                 speed_max=SPEED_MAX,
+                 loop_delay=LOOP_DELAY,
+                 start_distance=WINCH_DISTANCE):
+        arrays = np.broadcast_arrays(*[np.asarray(value, dtype=np.float64).ravel() for value in (security_begin,
+                                                                                                velocity_start,
+                                                                                                velocity_stop,
+                                                                                                speed_max,
+                                                                                                loop_delay,
+                                                                                                start_distance)])
+        (self.security_begin,
+         self.velocity_start,
+         self.velocity_stop,
+         self.speed_max,
+         self.loop_delay,
+         self.start_distance) = [array.copy() for array in arrays]
+
+    @staticmethod
+    def grid(**params) -> 'ParameterSweep':
+        """ Build a sweep from the cartesian product of parameter values.
+
+        Example : `ParameterSweep.grid(velocity_start=[1, 2], loop_delay=[0.01, 0.02])`
+        """
+        names = list(params.keys())
+        product = np.array(list(itertools.product(*[np.atleast_1d(params[name]) for name in names])), dtype=np.float64)
+        return ParameterSweep(**{name: product[:, index] for index, name in enumerate(names)})
+
+    def __len__(self):
+        return len(self.speed_max)
+
+    def run(self, max_time=300) -> dict:
+        """ Run all scenarios until stopped (or `max_time` virtual seconds).
+
+        Each scenario runs on its own tick count, `max_time` over its
+        `loop_delay`, so all of them simulate the same duration.
+
+        Returns
+        -------
+        dict
+            Arrays indexed like the parameter sets :
+            - time_to_target : seconds from start to target speed (nan if never)
+            - stop_time : seconds from start to the stop command (nan if never)
+            - stopping_distance : meters from the stop command to zero speed
+            - final_distance : rope length at the end in meter
+            - breached : True when the drum went past the start point
+            - completed : True when the winch is back to idle
+            - elapsed : simulated seconds
+        """
+        count = len(self)
+        state = np.full(count, self.__STATE_RUN, dtype=np.int8)
+        speed = np.zeros(count)
+        rotation = distance2rotate(self.start_distance)
+        ticks = np.zeros(count)
+
+        time_to_target = np.full(count, np.nan)
+        stop_time = np.full(count, np.nan)
+        stop_rotation = np.full(count, np.nan)
+        rotation_per_speed = distance2rotate(SPEED_TO_MS * self.loop_delay)
+
+        max_ticks = np.ceil(max_time / self.loop_delay - 1e-9)
+        for _ in range(int(max_ticks.max(initial=0))):
+            active = (state != self.__STATE_IDLE) & (ticks < max_ticks)
+            if (not active.any()):
+                break
+
+            running = state == self.__STATE_RUN
+            stopping = state == self.__STATE_STOP
+            elapsed = ticks * self.loop_delay
+
+            # __starting : increment then clamp back with the stop velocity.
+            increment = running & (speed < self.speed_max)
+            speed = np.where(increment, speed + self.velocity_start, speed)
+            reached = increment & (speed >= self.speed_max) & np.isnan(time_to_target)
+            time_to_target[reached] = elapsed[reached]
+
+            decrement = running & (speed > self.speed_max)
+            vel_stop = np.minimum(self.velocity_stop, speed - self.speed_max)
+            speed = np.where(decrement, np.where(speed > vel_stop, speed - vel_stop, 0), speed)
+
+            # __stopping
+            vel_stop = np.minimum(self.velocity_stop, speed)
+            speed = np.where(stopping, np.where(speed > vel_stop, speed - vel_stop, 0), speed)
+            state[stopping & (speed <= 0)] = self.__STATE_IDLE
+
+            # OneWayMode._extraMode : limit position START
+            security = running & (rotation - self.security_begin <= 0)
+            state[security] = self.__STATE_STOP
+            stop_time[security] = elapsed[security]
+            stop_rotation[security] = rotation[security]
+
+            # Drum kinematics during the tick.
+            rotation = np.where(active, rotation - speed * rotation_per_speed, rotation)
+            ticks += active
+
+        return {
+            "time_to_target": time_to_target,
+            "stop_time": stop_time,
+            "stopping_distance": rotate2distance(stop_rotation - rotation),
+            "final_distance": rotate2distance(rotation),
+            "breached": rotation < 0,
+            "completed": state == self.__STATE_IDLE,
+            "elapsed": ticks * self.loop_delay,
+        }
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" Winch state document and its Server-Sent Events stream. """
+
+from openwinch.constantes import SPEED_UNIT
+from openwinch.logger import logger
+from openwinch.pages import stateColor
+
+import json
+import queue
+import threading
+import time
+
+# Decimals of measures : sensor noise would change the document on every poll.
+MEASURE_DIGITS = 1
+
+# Events buffered per client before it is dropped.
+STREAM_QUEUE = 16
+# Delay without event before a keep-alive comment (seconds).
+STREAM_KEEPALIVE = 15
+
+
+def stateDocument(winch) -> dict:
+    """ Get the state of a winch as a JSON document. """
+    state = winch.getState()
+    return {
+        "state": state.name,
+        "color": stateColor(state),
+        "mode": winch.getMode().name,
+        "speed_target": winch.getSpeedTarget(),
+        "speed_current": round(winch.getSpeedCurrent(), MEASURE_DIGITS),
+        "speed_unit": SPEED_UNIT,
+        "distance": round(winch.getDistance(), MEASURE_DIGITS),
+        "battery": winch.getBattery(),
+    }
+
+
+def formatEvent(event_id, data) -> bytes:
+    """ Format a Server-Sent Event with a JSON data. """
+    return ("id: %d\ndata: %s\n\n" % (event_id, json.dumps(data, separators=(',', ':')))).encode()
+
+
+class Subscription(object):
+    """ Events of a `Broadcaster` client, dropped when its queue is full. """
+
+    def __init__(self, broadcaster, size=STREAM_QUEUE):
+        self.__broadcaster = broadcaster
+        self.__queue = queue.Queue(size)
+        self.closed = False
+
+    def put(self, event) -> bool:
+        """ Queue an event, False when the client is too slow. """
+        try:
+            self.__queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.close()
+            return False
+
+    def close(self):
+        self.closed = True
+        self.__broadcaster.unsubscribe(self)
+        # Wake up the reader.
+        try:
+            self.__queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def events(self, keepalive=STREAM_KEEPALIVE):
+        """ Generate events until closed, keep-alive comments while idle. """
+        try:
+            while not self.closed:
+                try:
+                    event = self.__queue.get(timeout=keepalive)
+                except queue.Empty:
+                    yield b":\n\n"
+                    continue
+
+                if (event is None):
+                    break
+                yield event
+        finally:
+            self.close()
+
+
+class Broadcaster(object):
+    """ Push state changes of a winch to many clients.
+
+    One producer thread reads the winch at `rate`, and formats an event with
+    the changed values only. Each client gets the same event through a bounded
+    queue : a client not reading fast enough is dropped (an `EventSource`
+    reconnects and gets the whole document again). The producer runs only
+    while there are clients.
+
+    Parameters
+    ----------
+    winch : Winch
+        Winch to watch.
+    rate : float, optional
+        Polls per second (default is 5)
+    size : int, optional
+        Events buffered per client (default is STREAM_QUEUE)
+    """
+
+    def __init__(self, winch, rate=5, size=STREAM_QUEUE):
+        self.__winch = winch
+        self.__period = 1 / rate
+        self.__size = size
+        self.__lock = threading.Lock()
+        # Held while events are put : keeps them in order for each client.
+        self.__publish = threading.Lock()
+        self.__subscriptions = []
+        self.__document = None
+        self.__event_id = 0
+        self.__thread = None
+
+        self.__events = 0
+        self.__dropped = 0
+
+    def subscribe(self, subscription=None) -> Subscription:
+        """ Add a client, its first event is the whole document.
+
+        Parameters
+        ----------
+        subscription : Subscription, optional
+            Client queue, with `put(event)` (default is a new `Subscription`)
+        """
+        if (subscription is None):
+            subscription = Subscription(self, self.__size)
+        with self.__publish:
+            with self.__lock:
+                if (self.__document is None):
+                    self.__document = stateDocument(self.__winch)
+                event = formatEvent(self.__event_id, self.__document)
+                self.__subscriptions.append(subscription)
+
+                if (self.__thread is None):
+                    self.__thread = threading.Thread(target=self.__loop, name="stream", args=(), daemon=True)
+                    self.__thread.start()
+
+            # Out of the lock : a failed put unsubscribes.
+            subscription.put(event)
+        return subscription
+
+    def getQueueSize(self) -> int:
+        return self.__size
+
+    def unsubscribe(self, subscription):
+        with self.__lock:
+            if (subscription in self.__subscriptions):
+                self.__subscriptions.remove(subscription)
+
+    def poll(self) -> int:
+        """ Publish the changed values to every client.
+
+        Returns
+        -------
+        int
+            Clients the event was sent to (0 when nothing changed).
+        """
+        document = stateDocument(self.__winch)
+        with self.__publish:
+            with self.__lock:
+                previous = self.__document or {}
+                delta = {key: value for key, value in document.items() if previous.get(key) != value}
+                self.__document = document
+                if (len(delta) == 0):
+                    return 0
+
+                self.__event_id += 1
+                self.__events += 1
+                event = formatEvent(self.__event_id, delta)
+                subscriptions = list(self.__subscriptions)
+
+            sent = 0
+            for subscription in subscriptions:
+                if (subscription.put(event)):
+                    sent += 1
+                else:
+                    self.dropped(subscription)
+        return sent
+
+    def dropped(self, subscription):
+        """ Count a client dropped because it was too slow. """
+        self.__dropped += 1
+        logger.warning("Stream client too slow, dropped.")
+
+    def __loop(self):
+        while True:
+            with self.__lock:
+                if (len(self.__subscriptions) == 0):
+                    # Next subscriber gets a fresh document.
+                    self.__document = None
+                    self.__thread = None
+                    return
+
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error("Stream poll failed : %s" % e)
+            time.sleep(self.__period)
+
+    def getStats(self) -> dict:
+        """ Get clients, events produced and clients dropped. """
+        with self.__lock:
+            clients = len(self.__subscriptions)
+        return {
+            "clients": clients,
+            "events": self.__events,
+            "dropped": self.__dropped,
+        }
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+# OpneWinchPy : a library for controlling the Raspberry Pi's Winch
+# Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
+
+""" JSON API for remote clients.
+
+`GET /api/v1/state` returns the state document with an ETag : a poll with
+`If-None-Match` gets a 304 until the document changes. `GET /api/v1/stream`
+pushes the changed values as Server-Sent Events. Commands are `POST` and
+return the new state document.
+"""
+
+from flask import (Blueprint, Response, abort, jsonify, request)
+from openwinch.app import (current_broadcaster, current_winch)
+from openwinch.constantes import (SPEED_MAX, SPEED_MIN)
+from openwinch.telemetry import stateDocument
+
+API_VERSION = 1
+
+web_api = Blueprint('web_api', __name__, url_prefix='/api/v%d' % API_VERSION)
+
+
+def render_state():
+    response = jsonify(stateDocument(current_winch()))
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@web_api.route("/state")
+def state():
+    return render_state()
+
+
+@web_api.route("/stream")
+def stream():
+    subscription = current_broadcaster().subscribe()
+    return Response(subscription.events(),
+                    mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@web_api.route("/start", methods=['POST'])
+def start():
+    current_winch().start()
+    return render_state()
+
+
+@web_api.route("/stop", methods=['POST'])
+def stop():
+    current_winch().stop()
+    return render_state()
+
+
+@web_api.route("/up", methods=['POST'])
+def up():
+    current_winch().speedUp()
+    return render_state()
+
+
+@web_api.route("/down", methods=['POST'])
+def down():
+    current_winch().speedDown()
+    return render_state()
+
+
+@web_api.route("/speed", methods=['POST'])
+def speed():
+    """ Set the speed target from `{"value": speed}` (or a `value` form field). """
+    body = request.get_json(silent=True)
+    value = body.get("value") if isinstance(body, dict) else request.values.get("value")
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        abort(400, "value must be an integer")
+
+    if (not current_winch().speedValue(value)):
+        abort(400, "value must be between %d and %d" % (SPEED_MIN, SPEED_MAX))
+    return render_state()
+
+
+@web_api.route("/halt", methods=['POST'])
+def halt():
+    current_winch().emergency()
+    return render_state()
+
+
+@web_api.route("/reset", methods=['POST'])
+def reset():
+    current_winch().initialize()
+    return render_state()
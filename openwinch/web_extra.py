@@ -4,20 +4,15 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
-from flask import (Blueprint, render_template)
-from openwinch.constantes import SPEED_UNIT
-from openwinch.singleton import winch
+from flask import Blueprint
+from openwinch.app import (current_winch, render_page)
+from openwinch.pages import extraContext
 
 web_extra = Blueprint('web_extra', __name__)
 
 
 def render_extra():
-    return render_template("extra.html",
-                           mode=winch.getMode(),
-                           battery=winch.getBattery(),
-                           speed_target=winch.getSpeedTarget(),
-                           speed_unit=SPEED_UNIT,
-                           enable="white")
+    return render_page("extra.html", extraContext)
 
 
 @web_extra.route("/extra")
@@ -27,7 +22,7 @@ def extra():
 
 @web_extra.route("/reset")
 def reset():
-    winch.initialize()
+    current_winch().initialize()
     return render_extra()
 
 
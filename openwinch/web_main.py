@@ -4,29 +4,15 @@
 # OpneWinchPy : a library for controlling the Raspberry Pi's Winch
 # Copyright (c) 2020 Mickael Gaillard <mick.gaillard@gmail.com>
 
-from flask import (Blueprint, render_template)
-from openwinch.constantes import SPEED_UNIT
-from openwinch.controller import State
-from openwinch.singleton import winch
+from flask import Blueprint
+from openwinch.app import (current_winch, render_page)
+from openwinch.pages import mainContext
 
 web_main = Blueprint('web_main', __name__)
 
 
 def render_main():
-    enable = "white"
-    if (winch.getState().isRun):
-        enable = "lime"
-    elif (winch.getState() == State.ERROR):
-        enable = "red"
-    elif (winch.getState() == State.UNKNOWN or winch.getState() == State.INIT):
-        enable = "orange"
-
-    return render_template("index.html",
-                           mode=winch.getMode(),
-                           battery=winch.getBattery(),
-                           speed_target=winch.getSpeedTarget(),
-                           speed_unit=SPEED_UNIT,
-                           enable=enable)
+    return render_page("index.html", mainContext)
 
 
 @web_main.route("/")
@@ -36,29 +22,29 @@ def index():
 
 @web_main.route("/start")
 def start():
-    winch.start()
+    current_winch().start()
     return render_main()
 
 
 @web_main.route("/stop")
 def stop():
-    winch.stop()
+    current_winch().stop()
     return render_main()
 
 
 @web_main.route("/up")
 def up():
-    winch.speedUp()
+    current_winch().speedUp()
     return render_main()
 
 
 @web_main.route("/down")
 def down():
-    winch.speedDown()
+    current_winch().speedDown()
     return render_main()
 
 
 @web_main.route("/halt")
 def halt():
-    winch.emergency()
+    current_winch().emergency()
     return render_main()
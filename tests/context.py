@@ -3,6 +3,8 @@
 
 import os
 import sys
+# No debug log file in the repository from test runs.
+os.environ.setdefault('OW_LOG_FILE', '')
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import openwinch  # noqa
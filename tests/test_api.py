@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.app import create_app
+from openwinch.constantes import SPEED_MAX
+from openwinch.controller import Winch
+
+
+class ApiTest(unittest.TestCase):
+
+    def setUp(self):
+        self.winch = Winch(threaded=False)
+        self.client = create_app(self.winch).test_client()
+
+    def test_state_etag(self):
+        response = self.client.get("/api/v1/state")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["speed_target"], self.winch.getSpeedTarget())
+
+        etag = response.headers["ETag"]
+        response = self.client.get("/api/v1/state", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+
+        self.client.post("/api/v1/up")
+        response = self.client.get("/api/v1/state", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_command(self):
+        response = self.client.post("/api/v1/halt")
+        self.assertEqual(response.get_json()["state"], "ERROR")
+
+        response = self.client.post("/api/v1/reset")
+        self.assertEqual(response.get_json()["state"], "INIT")
+
+    def test_speed(self):
+        response = self.client.post("/api/v1/speed", json={"value": 12})
+        self.assertEqual(response.get_json()["speed_target"], 12)
+
+        self.assertEqual(self.client.post("/api/v1/speed", json={"value": SPEED_MAX + 1}).status_code, 400)
+        self.assertEqual(self.client.post("/api/v1/speed", json={"value": "fast"}).status_code, 400)
+        self.assertEqual(self.client.post("/api/v1/speed", data={"value": "20"}).get_json()["speed_target"], 20)
+        self.assertEqual(self.winch.getSpeedTarget(), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.battery import (BatterySampler, SyntheticBattery, SysfsBattery, openBattery)
+from openwinch.simulation import VirtualClock
+
+import os
+import tempfile
+
+
+class BatteryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.write("energy_full", 2000)
+        self.write("energy_now", 1500)
+
+    def write(self, name, value):
+        with open(os.path.join(self.path, name), "w") as file:
+            file.write("%s\n" % value)
+
+    def test_sysfs(self):
+        battery = openBattery(self.path)
+        self.assertIsInstance(battery, SysfsBattery)
+        self.assertEqual(battery.read(), 75)
+
+        # Same file descriptors, new content.
+        self.write("energy_now", 500)
+        self.assertEqual(battery.read(), 25)
+        battery.close()
+
+    def test_synthetic(self):
+        clock = VirtualClock()
+        battery = openBattery(os.path.join(self.path, "missing"), clock)
+        self.assertIsInstance(battery, SyntheticBattery)
+        self.assertEqual(battery.read(), 100)
+
+        clock.advance(3600)
+        self.assertEqual(battery.read(), 75)
+
+    def test_sampler_cache(self):
+        clock = VirtualClock()
+        sampler = BatterySampler(openBattery(self.path), 5, clock)
+        self.assertEqual(sampler.getSample(), (75, 0))
+
+        self.write("energy_now", 1000)
+        clock.advance(1)
+        self.assertEqual(sampler.getValue(), 75)
+
+        clock.advance(5)
+        self.assertEqual(sampler.getSample(), (50, 6))
+        sampler.stop()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import threading
+import time
+import unittest
+from .context import openwinch  # noqa
+
+from PIL import (Image, ImageDraw)
+
+from openwinch.controller import Winch
+from openwinch.display import (FontRegistry, Gui, SpriteCache)
+from openwinch.display_config import (FONT_ICON, FONT_PRELOAD, FONT_TEXT)
+from openwinch.hardware_config import (LCD_FPS, LCD_HEIGHT, LCD_IDLE_FPS, LCD_WIDTH)
+from openwinch.input import InputType
+from openwinch.state import State
+
+
+class FakeWinch(object):
+
+    distance = 0
+    state = State.RUNNING
+
+    def getBattery(self):
+        return 50
+
+    def getRemote(self):
+        return 15
+
+    def getSpeedTarget(self):
+        return 20
+
+    def getDistance(self):
+        return self.distance
+
+    def getState(self):
+        return self.state
+
+
+class FontRegistryTest(unittest.TestCase):
+
+    def test_load_once(self):
+        fonts = FontRegistry()
+        font = fonts.get(FONT_TEXT, 12)
+
+        self.assertIs(fonts.get(FONT_TEXT, 12), font)
+        self.assertIsNot(fonts.get(FONT_TEXT, 14), font)
+        self.assertEqual(len(fonts), 2)
+
+    def test_gui_warm(self):
+        gui = Gui(Winch(threaded=False))
+
+        self.assertEqual(len(gui.getFonts()), len(FONT_PRELOAD))
+
+    def test_main_screen_negative_distance(self):
+        winch = FakeWinch()
+        gui = Gui(winch)
+
+        for distance in (-5, 0, 1e6):
+            winch.distance = distance
+            gui.render()
+
+        self.assertEqual(len(gui.getFonts()), len(FONT_PRELOAD))
+
+
+class SpriteCacheTest(unittest.TestCase):
+
+    def test_same_pixels_as_text(self):
+        gui = Gui(FakeWinch())
+
+        for xy, text, face, fill in (((1, 0), "Mode selector", FONT_TEXT, "white"),
+                                     ((16.33, 50.56), "\uf04b", FONT_ICON, "white"),
+                                     ((0, 51.2), "exit to save...", FONT_TEXT, "black")):
+            background = 255 if fill == "black" else 0
+            expected = Image.new('1', (LCD_WIDTH, LCD_HEIGHT), background)
+            ImageDraw.Draw(expected).text(xy, text, fill=fill, font=gui.getFont(face, 12))
+
+            frame = gui.getFrame()
+            frame.paste(background, (0, 0, LCD_WIDTH, LCD_HEIGHT))
+            gui.drawSprite(xy, text, face, 12, fill=fill)
+            self.assertEqual(frame.tobytes(), expected.tobytes(), text)
+
+        self.assertEqual(len(gui.getSprites()), 3)
+
+    def test_bounded(self):
+        sprites = SpriteCache(FontRegistry(), size=4)
+
+        first = sprites.get("0", FONT_TEXT, 12)[0]
+        for value in range(1, 10):
+            sprites.get(str(value), FONT_TEXT, 12)
+            sprites.get("0", FONT_TEXT, 12)
+
+        self.assertEqual(len(sprites), 4)
+        self.assertIs(sprites.get("0", FONT_TEXT, 12)[0], first)
+
+
+class RedrawTest(unittest.TestCase):
+
+    def test_skip_unchanged_view(self):
+        winch = FakeWinch()
+        winch.state = State.IDLE
+        gui = Gui(winch)
+
+        self.assertTrue(gui.refresh())
+        self.assertFalse(gui.refresh())
+
+        winch.distance = 100
+        self.assertTrue(gui.refresh())
+        gui.enter(InputType.RIGHT)
+        self.assertTrue(gui.refresh())
+        self.assertFalse(gui.refresh())
+
+        stats = gui.getFrameStats()
+        self.assertEqual((stats["rendered"], stats["skipped"]), (3, 2))
+
+    def test_animation_frame_rate(self):
+        winch = FakeWinch()
+        winch.state = State.IDLE
+        gui = Gui(winch)
+        self.assertEqual(gui.getFrameRate(), LCD_IDLE_FPS)
+
+        gui.enter(InputType.LEFT)
+        self.assertEqual(gui.getFrameRate(), LCD_FPS)
+
+        winch.state = State.RUNNING
+        self.assertTrue(gui.refresh())
+        self.assertTrue(gui.refresh())
+
+
+class SlowDevice(object):
+    """ Device with a slow bus, keeping the frames displayed. """
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.frames = []
+        self.sending = threading.Event()
+
+    def show(self):
+        pass
+
+    def display(self, image):
+        self.sending.set()
+        time.sleep(self.delay)
+        self.frames.append(image.tobytes())
+
+
+class DoubleBufferTest(unittest.TestCase):
+
+    def test_synchronous_transfer(self):
+        device = SlowDevice(0)
+        gui = Gui(FakeWinch(), device=device)
+
+        gui.enter(InputType.RIGHT)
+        gui.display()
+
+        stats = gui.getFrameStats()
+        self.assertEqual(len(device.frames), 1)
+        self.assertEqual((stats["transferred"], stats["dropped"]), (1, 0))
+        self.assertEqual(stats["latency"]["count"], 1)
+
+    def test_drop_stale_frames(self):
+        device = SlowDevice(0.2)
+        winch = FakeWinch()
+        gui = Gui(winch, device=device)
+        gui.boot()
+        self.assertTrue(device.sending.wait(1))
+
+        # Bus busy with the boot frame : only the last frame is sent.
+        for distance in (10, 20, 30):
+            winch.distance = distance
+            gui.display()
+        expected = gui.getFrame().tobytes()
+
+        deadline = time.monotonic() + 2
+        while (len(device.frames) < 2 and time.monotonic() < deadline):
+            time.sleep(0.01)
+
+        stats = gui.getFrameStats()
+        self.assertEqual(device.frames[-1], expected)
+        self.assertEqual((stats["transferred"], stats["dropped"]), (2, 2))
+        self.assertEqual(stats["render"]["count"], 4)
+        gui.stop()
+
+    def test_stop(self):
+        gui = Gui(FakeWinch(), device=SlowDevice(0))
+        before = set(threading.enumerate())
+        gui.boot()
+        self.assertGreater(len(set(threading.enumerate()) - before), 0)
+        gui.stop()
+
+        self.assertEqual(set(threading.enumerate()) - before, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from gpiozero.pins.mock import MockFactory
+
+from openwinch.encoder import RotationEncoder
+
+import time
+
+
+class RotationEncoderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = MockFactory()
+        self.encoder = RotationEncoder(5, 6, pulses_per_rotation=20, pin_factory=self.factory)
+        self.pin_a = self.factory.pin(5)
+        self.pin_b = self.factory.pin(6)
+
+    def tearDown(self):
+        self.encoder.close()
+        self.factory.close()
+
+    def pulses(self, count):
+        drive_high = self.pin_a.drive_high
+        drive_low = self.pin_a.drive_low
+        for _ in range(count):
+            drive_low()
+            drive_high()
+
+    def test_count_pulse_train(self):
+        count = 20000
+        self.pulses(count)
+
+        self.assertEqual(self.encoder.getPulses(), count)
+        self.assertEqual(self.encoder.getRotation(), count / 20)
+
+    def test_direction(self):
+        self.pulses(100)
+        self.pin_b.drive_low()
+        self.pulses(40)
+
+        self.assertEqual(self.encoder.getPulses(), 60)
+        self.encoder.reset()
+        self.assertEqual(self.encoder.getRotation(), 0)
+
+    def test_speed_acceleration(self):
+        # 200 pulses/s, then 400 pulses/s.
+        ticks = time.monotonic() - 1
+        for period in [0.005] * 50 + [0.0025] * 8:
+            ticks += period
+            self.encoder._pulse(ticks, True)
+
+        self.assertLess(self.encoder.getSpeed(), 0.1)  # no pulse since 0.7 s
+        self.assertGreater(self.encoder.getAcceleration(), 0)
+
+        now = time.monotonic()
+        for _ in range(16):
+            now += 0.0025
+            self.encoder._pulse(now, True)
+        self.assertAlmostEqual(self.encoder.getSpeed(), 400 / 20, delta=1)
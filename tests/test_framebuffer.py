@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from luma.core.render import canvas
+from luma.oled.device import sh1106
+from PIL import Image
+
+from openwinch.framebuffer import (PageDiffDevice, diffColumns, toPages)
+
+import random
+
+
+class RecordSerial(object):
+    """ I2C interface emulating the SH1106 display RAM. """
+
+    def __init__(self):
+        self.ram = [bytearray(132) for _ in range(8)]
+        self.page = 0
+        self.column = 0
+        self.sent = 0
+
+    def command(self, *cmd):
+        for value in cmd:
+            if (value & 0xF0 == 0xB0):
+                self.page = value & 0x0F
+            elif (value & 0xF0 == 0x00):
+                self.column = (self.column & 0xF0) | value
+            elif (value & 0xF0 == 0x10):
+                self.column = (self.column & 0x0F) | ((value & 0x0F) << 4)
+
+    def data(self, data):
+        for value in data:
+            self.ram[self.page][self.column] = value
+            self.column += 1
+        self.sent += len(data)
+
+    def cleanup(self):
+        pass
+
+
+class FramebufferTest(unittest.TestCase):
+
+    def setUp(self):
+        self.serial = RecordSerial()
+        self.device = sh1106(self.serial)
+        self.device.persist = True
+
+    def test_pages(self):
+        image = Image.new('1', (128, 64))
+        image.putpixel((3, 9), 1)
+        image.putpixel((3, 15), 1)
+
+        pages = toPages(image)
+        self.assertEqual(len(pages), 8)
+        self.assertEqual(pages[1][3], 0x82)
+        self.assertEqual(sum(map(sum, pages)), 0x82)
+
+    def test_diff_columns(self):
+        self.assertEqual(diffColumns(b'\0' * 16, b'\0' * 16), [])
+        self.assertEqual(diffColumns(b'\0' * 16, b'\1\1' + b'\0' * 5 + b'\1' + b'\0' * 8), [(0, 2), (7, 8)])
+        self.assertEqual(diffColumns(b'\0' * 16, b'\1\0\0\1' + b'\0' * 12), [(0, 4)])
+
+    def test_display_ram(self):
+        diff = PageDiffDevice(self.device)
+        reference = RecordSerial()
+        full = sh1106(reference)
+        full.persist = True
+
+        random.seed(0)
+        for frame in range(20):
+            point = (random.randrange(128), random.randrange(64))
+            for device in (diff, full):
+                with canvas(device) as draw:
+                    draw.text((2, 0), "%d%%" % (frame % 3), fill="white")
+                    draw.rectangle([4, 11, 4 + frame, 14], fill="white")
+                    draw.point(point, fill="white")
+
+            self.assertEqual(self.serial.ram, reference.ram)
+
+        stats = diff.getStats()
+        self.assertEqual(stats["frames"], 20)
+        self.assertEqual(stats["bytes"], self.serial.sent - 128 * 8)
+        self.assertLess(self.serial.sent, reference.sent / 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
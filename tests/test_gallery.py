@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import os
+import tempfile
+import unittest
+from .context import openwinch  # noqa
+
+from PIL import Image
+
+from openwinch.config import config
+from openwinch.display import (GuiType, MenuScreen)
+from openwinch.gallery import (GALLERY, generate, newGui, render)
+from openwinch.state import State
+
+
+class GalleryTest(unittest.TestCase):
+
+    def test_render_cursor(self):
+        gui = newGui()
+        first = render(gui, MenuScreen, State.IDLE, 0).tobytes()
+        second = render(gui, MenuScreen, State.IDLE, 1).tobytes()
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(gui.cursor_pos, 1)
+
+    def test_generate(self):
+        with tempfile.TemporaryDirectory() as output:
+            paths = generate(output, GALLERY[:3], workers=2)
+
+            self.assertEqual([os.path.basename(path) for path in paths],
+                             ["OpenWinch_000001.png", "OpenWinch_000002.png", "OpenWinch_000003.png"])
+            with Image.open(paths[0]) as image:
+                self.assertEqual(image.size, (256, 128))
+
+    def test_generate_without_display(self):
+        # No SH1106 nor capture device opened by the gallery.
+        previous = config.GUI
+        config.GUI = GuiType.SH1106_I2C.name
+        try:
+            with tempfile.TemporaryDirectory() as output:
+                paths = generate(output, GALLERY[:1], workers=1)
+
+                self.assertEqual(os.listdir(output), ["OpenWinch_000001.png"])
+                self.assertEqual(paths, [os.path.join(output, "OpenWinch_000001.png")])
+        finally:
+            config.GUI = previous
+
+
+if __name__ == '__main__':
+    unittest.main()
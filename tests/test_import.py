@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+import importlib
+import os
+import subprocess
+import sys
+import types
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Import time of the package in microseconds, over a bare interpreter loading
+# the standard modules it needs (Flask, luma and PIL alone cost several hundred
+# milliseconds). The package itself measures about 6 ms, the margin covers the
+# noise of a loaded machine. Best of IMPORT_RUNS interpreters, run in turn
+# with the baseline ones so that both see the same load.
+IMPORT_BUDGET = 15000
+IMPORT_RUNS = 5
+
+BASELINE_SCRIPT = "import abc, atexit, collections, enum, importlib, logging, math, threading, time"
+
+# logging.handlers only with a log file, none here (OW_LOG_FILE empty).
+HEAVY_MODULES = ['flask', 'luma', 'PIL', 'gpiozero', 'click', 'numpy', 'openwinch.singleton', 'logging.handlers']
+
+
+class ImportTest(unittest.TestCase):
+
+    def __importPackage(self):
+        """ Import the package in a fresh interpreter with `-X importtime`. """
+        script = "import sys, openwinch; print(' '.join(sys.modules))"
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                                cwd=ROOT, env=dict(os.environ, OW_LOG_FILE=''), capture_output=True, text=True, check=True)
+        return result.stdout.split(), result.stderr.splitlines()
+
+    def __importTime(self, script) -> int:
+        """ Sum of the top level cumulative import times of a fresh interpreter. """
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                                cwd=ROOT, env=dict(os.environ, OW_LOG_FILE=''), capture_output=True, text=True, check=True)
+        total = 0
+        for line in result.stderr.splitlines():
+            fields = line.split('|')
+            if (len(fields) == 3 and fields[1].strip().isdigit() and not fields[2].startswith('  ')):
+                total += int(fields[1])
+        return total
+
+    def test_import_budget(self):
+        package = []
+        baseline = []
+        for _ in range(IMPORT_RUNS):
+            package.append(self.__importTime("import openwinch"))
+            baseline.append(self.__importTime(BASELINE_SCRIPT))
+
+        self.assertLess(min(package) - min(baseline), IMPORT_BUDGET)
+
+    def test_no_heavy_import(self):
+        modules, report = self.__importPackage()
+
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+
+    def test_web_exports(self):
+        from flask import Blueprint
+
+        # Blueprint and module, before and after the submodule import.
+        self.assertIsInstance(openwinch.web_main_blueprint, Blueprint)
+        self.assertIsInstance(openwinch.web_main, types.ModuleType)
+        importlib.import_module('openwinch.web_api')
+        self.assertIsInstance(openwinch.web_api_blueprint, Blueprint)
+        self.assertIsInstance(openwinch.web_api, types.ModuleType)
+        self.assertIs(openwinch.web_extra_blueprint, openwinch.web_extra.web_extra)
+
+
+if __name__ == '__main__':
+    unittest.main()
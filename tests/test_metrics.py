@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.metrics import Histogram
+
+
+class HistogramTest(unittest.TestCase):
+
+    def test_merge(self):
+        first = Histogram(resolution=0.001, size=100)
+        second = Histogram(resolution=0.001, size=100)
+        expected = Histogram(resolution=0.001, size=100)
+        for value in (0.0015, 0.004, 0.2):
+            first.record(value)
+            expected.record(value)
+        for value in (0.0005, 0.05):
+            second.record(value)
+            expected.record(value)
+
+        first.merge(second)
+        self.assertEqual(first.toDict(), expected.toDict())
+        self.assertEqual(first.getBuckets(), expected.getBuckets())
+
+        with self.assertRaises(ValueError):
+            first.merge(Histogram(resolution=0.01, size=100))
+
+    def test_percentile_within_bucket(self):
+        histogram = Histogram(resolution=0.001, size=100)
+        for value in (0.00010, 0.00012, 0.00014, 0.00016, 0.00018):
+            histogram.record(value)
+
+        # All in the first bucket : bounded by min and max, not the bucket.
+        self.assertAlmostEqual(histogram.percentile(50), 0.000148)
+        self.assertAlmostEqual(histogram.percentile(100), 0.00018)
+        self.assertLess(histogram.percentile(50), histogram.getMax())
+
+    def test_percentile_bounds(self):
+        histogram = Histogram(resolution=0.001, size=10)
+        for value in (0.0001, 0.0009):
+            histogram.record(value)
+
+        self.assertEqual(histogram.percentile(0), 0.0001)
+        self.assertEqual(histogram.percentile(100), 0.0009)
+
+        # Negative values share the first bucket, above their max.
+        histogram.reset()
+        for value in (-0.002, -0.001):
+            histogram.record(value)
+
+        self.assertEqual(histogram.percentile(0), -0.002)
+        self.assertEqual(histogram.percentile(100), -0.001)
+        for percent in range(0, 101, 10):
+            self.assertGreaterEqual(histogram.percentile(percent), -0.002)
+            self.assertLessEqual(histogram.percentile(percent), -0.001)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from gpiozero import Device, OutputDevice, PWMOutputDevice
+from gpiozero.pins.mock import MockFactory, MockPWMPin
+
+from openwinch.hardware_config import RELAY_MIN_TOGGLE
+from openwinch.output import ShadowOutput
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ShadowOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.factory = MockFactory(pin_class=MockPWMPin)
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        self.factory.close()
+
+    def test_skip_redundant_writes(self):
+        device = PWMOutputDevice(18, pin_factory=self.factory)
+        output = ShadowOutput(device, resolution=100, clock=self.clock)
+
+        for value in (0.5, 0.5, 0.501, 0.5, 0.6):
+            output.write(value)
+
+        self.assertAlmostEqual(device.value, 0.6)
+        self.assertEqual(output.getStats(), {"requested": 5, "written": 2, "skipped": 3, "deferred": 0})
+
+    def test_relay_min_toggle(self):
+        device = OutputDevice(25, pin_factory=self.factory)
+        output = ShadowOutput(device, min_toggle=0.1, clock=self.clock)
+
+        self.assertTrue(output.write(True))
+        self.clock.now = 0.05
+        self.assertFalse(output.write(False))
+        self.assertTrue(device.value)
+
+        # Back to the current value : the pending toggle is dropped.
+        output.write(True)
+        self.clock.now = 0.2
+        self.assertFalse(output.flush())
+
+        self.clock.now = 0.25
+        self.assertTrue(output.write(False))
+        self.clock.now = 0.3
+        output.write(True)
+        self.assertFalse(output.flush())
+        self.clock.now = 0.4
+        self.assertTrue(output.flush())
+        self.assertTrue(device.value)
+        self.assertEqual(output.getStats()["deferred"], 2)
+
+    def test_force_bypass_interval(self):
+        device = OutputDevice(25, pin_factory=self.factory)
+        output = ShadowOutput(device, min_toggle=0.1, clock=self.clock)
+
+        output.write(True)
+        self.assertTrue(output.write(False, force=True))
+        self.assertFalse(device.value)
+
+
+class ClockWinch(object):
+
+    def __init__(self, clock):
+        self.clock = clock
+
+    def getClock(self):
+        return self.clock
+
+    def getGui(self):
+        return None
+
+
+class RaspberryPiOutputTest(unittest.TestCase):
+
+    def setUp(self):
+        from openwinch.hardwarePi import RaspberryPi
+
+        self.previous = Device.pin_factory
+        Device.pin_factory = MockFactory(pin_class=MockPWMPin)
+        self.clock = FakeClock()
+        self.board = RaspberryPi(ClockWinch(self.clock))
+        self.board.initialize()
+
+    def tearDown(self):
+        Device.pin_factory.close()
+        Device.pin_factory = self.previous
+
+    def test_no_throttle_before_reverse(self):
+        self.clock.now = RELAY_MIN_TOGGLE / 2
+        self.board.setReverse(True)
+        self.board.setThrottleValue(0.5)
+        self.assertEqual(self.board.getThrottleValue(), 0)
+
+        # Reverse relay switched on the next write.
+        self.clock.now = RELAY_MIN_TOGGLE
+        self.board.setThrottleValue(0.5)
+        self.assertGreater(self.board.getThrottleValue(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from PIL import (Image, ImageDraw)
+
+from openwinch.display import (Gui, MenuScreen, SecurityDistanceScreen)
+from openwinch.framebuffer import toPages
+from openwinch.state import State
+
+from .test_display import FakeWinch
+
+import importlib.util
+import random
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class PackedFrameTest(unittest.TestCase):
+
+    def test_rectangles(self):
+        from openwinch.packed import (PackedDraw, PackedFrame)
+
+        frame = PackedFrame((128, 64))
+        draw = PackedDraw(frame, None)
+        image = Image.new('1', (128, 64))
+        reference = ImageDraw.Draw(image)
+
+        random.seed(0)
+        for _ in range(200):
+            x0, x1 = sorted(random.uniform(-10, 140) for _ in range(2))
+            y0, y1 = sorted(random.uniform(-10, 70) for _ in range(2))
+            fill, outline = random.choice([("white", "white"), ("black", "white"), ("white", "black"), ("black", None)])
+            for target in (draw, reference):
+                target.rectangle([x0, y0, x1, y1], fill=fill, outline=outline)
+
+        self.assertEqual(frame.tobytes(), image.tobytes())
+        self.assertEqual(frame.toPages(), toPages(image))
+
+    def test_screens_same_as_pil(self):
+        winch = FakeWinch()
+        for state in (State.IDLE, State.RUNNING, State.ERROR):
+            winch.state = state
+            for screen in (None, MenuScreen, SecurityDistanceScreen):
+                for cursor in range(4):
+                    frames = []
+                    for backend in ('PIL', 'PACKED'):
+                        gui = Gui(winch, backend)
+                        if (screen is not None):
+                            gui.screen = screen(gui)
+                        gui.cursor_pos = cursor
+                        frames.append(gui.render().tobytes())
+
+                    self.assertEqual(frames[0], frames[1], (state, screen, cursor))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import gzip
+import threading
+import time
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.app import create_app
+from openwinch.controller import Winch
+from openwinch.pages import PageCache
+
+
+class PageCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.winch = Winch(threaded=False)
+        self.renders = 0
+
+    def render(self):
+        self.renders += 1
+        time.sleep(0.05)
+        return "speed %s" % self.winch.getSpeedTarget()
+
+    def test_version(self):
+        pages = PageCache(self.winch)
+        page = pages.get("index", self.render)
+
+        self.assertIs(pages.get("index", self.render), page)
+        self.assertEqual(gzip.decompress(page.gzip), page.body)
+
+        self.winch.speedUp()
+        self.assertEqual(pages.get("index", self.render).body, ("speed %s" % self.winch.getSpeedTarget()).encode())
+        self.assertEqual(self.renders, 2)
+        self.assertEqual(pages.getStats(), {"hits": 1, "misses": 2, "shared": 0})
+
+    def test_single_flight(self):
+        pages = PageCache(self.winch)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(pages.get("index", self.render))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.renders, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+        self.assertEqual(pages.getStats()["shared"] + pages.getStats()["hits"], 3)
+
+    def test_gzip_response(self):
+        client = create_app(self.winch).test_client()
+        plain = client.get("/")
+        packed = client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(packed.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(packed.data), plain.data)
+        self.assertIn(b"%d" % (self.winch.getSpeedTarget() + 1), client.get("/up").data)
+
+    def test_mode_name(self):
+        # Same value as the "mode" of the state stream.
+        page = create_app(self.winch).test_client().get("/").data
+        self.assertIn(b'<td id="value-mode">%s</td>' % self.winch.getMode().name.encode(), page)
+
+
+if __name__ == '__main__':
+    unittest.main()
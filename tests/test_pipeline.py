@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.mode import OneWayMode
+from openwinch.pipeline import BoardPipeline
+
+import threading
+import time
+
+
+class RecordBoard(object):
+
+    def __init__(self):
+        self.calls = []
+        self.applied = threading.Event()
+
+    def initialize(self):
+        self.calls.append(('initialize',))
+
+    def emergency(self):
+        self.calls.append(('emergency',))
+
+    def setThrottleValue(self, value):
+        self.calls.append(('setThrottleValue', value))
+        self.applied.set()
+
+    def setReverse(self, enable):
+        self.calls.append(('setReverse', enable))
+
+    def getRotationFromBegin(self):
+        return 42
+
+
+class ClockWinch(object):
+
+    def getClock(self):
+        return time.monotonic
+
+
+class BoardPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self.board = RecordBoard()
+        self.pipeline = BoardPipeline(self.board)
+
+    def test_throttle_coalescing(self):
+        for value in (0.1, 0.2, 0.3):
+            self.pipeline.setThrottleValue(value)
+        self.pipeline.setReverse(True)
+        self.assertEqual(self.board.calls, [])
+
+        self.pipeline.drain()
+        self.assertEqual(self.board.calls, [('setThrottleValue', 0.3), ('setReverse', True)])
+
+        stats = self.pipeline.getPipelineStats()
+        self.assertEqual(stats["applied"], 2)
+        self.assertEqual(stats["coalesced"], 2)
+        self.assertEqual(stats["depth"], 0)
+        self.assertEqual(stats["depth_max"], 2)
+        self.assertEqual(stats["latency"]["count"], 2)
+
+    def test_command_order(self):
+        self.pipeline.setThrottleValue(0.1)
+        self.pipeline.setReverse(True)
+        self.pipeline.setThrottleValue(0.2)
+        self.pipeline.setThrottleValue(0.3)
+        self.pipeline.drain()
+
+        self.assertEqual(self.board.calls, [('setThrottleValue', 0.1), ('setReverse', True), ('setThrottleValue', 0.3)])
+
+    def test_initialize_applied(self):
+        self.pipeline.setThrottleValue(0.1)
+        self.pipeline.initialize()
+        self.assertEqual(self.board.calls, [('setThrottleValue', 0.1), ('initialize',)])
+
+        self.pipeline.start()
+        try:
+            self.pipeline.initialize()
+            self.assertEqual(self.board.calls[-1], ('initialize',))
+        finally:
+            self.pipeline.stop()
+
+    def test_emergency_jump_queue(self):
+        self.pipeline.setThrottleValue(0.5)
+        self.pipeline.setReverse(True)
+        self.pipeline.emergency()
+        self.pipeline.drain()
+
+        self.assertEqual(self.board.calls, [('emergency',)])
+
+    def test_mode_emergency_not_queued(self):
+        mode = OneWayMode(ClockWinch(), self.pipeline)
+        self.pipeline.setThrottleValue(0.5)
+        mode.emergency()
+
+        self.assertEqual(self.board.calls, [('emergency',)])
+        self.assertEqual(self.pipeline.getPipelineStats()["depth"], 0)
+
+    def test_io_thread(self):
+        self.pipeline.start()
+        try:
+            self.pipeline.setThrottleValue(0.4)
+            self.assertTrue(self.board.applied.wait(1))
+        finally:
+            self.pipeline.stop()
+
+        self.assertEqual(self.board.calls, [('setThrottleValue', 0.4)])
+
+    def test_proxy_reads(self):
+        self.assertEqual(self.pipeline.getRotationFromBegin(), 42)
+
+
+if __name__ == '__main__':
+    unittest.main()
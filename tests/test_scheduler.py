@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.mode import OneWayMode
+from openwinch.scheduler import (LoopScheduler, OverrunPolicy)
+from openwinch.state import State
+
+import threading
+import time
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.now += delay
+
+
+class LoopSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def scheduler(self, policy):
+        return LoopScheduler(100, policy, max_catch_up=5, clock=self.clock.time, sleep=self.clock.sleep)
+
+    def test_no_drift(self):
+        scheduler = self.scheduler(OverrunPolicy.CATCH_UP)
+        scheduler.start()
+        for _ in range(100):
+            self.clock.now += 0.004  # work of the tick
+            scheduler.wait()
+
+        self.assertAlmostEqual(self.clock.now, 1.0)
+        self.assertEqual(scheduler.getOverruns(), 0)
+        self.assertAlmostEqual(scheduler.getStats()["period"]["max"], 0.01)
+
+    def test_catch_up(self):
+        scheduler = self.scheduler(OverrunPolicy.CATCH_UP)
+        scheduler.start()
+        self.clock.now += 0.035
+        scheduler.wait()
+        for _ in range(9):
+            scheduler.wait()
+
+        # 10 ticks after start fit in 100 ms despite the overrun.
+        self.assertAlmostEqual(self.clock.now, 0.1)
+        self.assertEqual(scheduler.getOverruns(), 1)
+        self.assertEqual(scheduler.getStats()["skipped"], 0)
+
+    def test_catch_up_limit(self):
+        scheduler = self.scheduler(OverrunPolicy.CATCH_UP)
+        scheduler.start()
+        self.clock.now += 0.5
+        scheduler.wait()
+        scheduler.wait()
+
+        self.assertAlmostEqual(self.clock.now, 0.51)
+        self.assertEqual(scheduler.getStats()["skipped"], 49)
+
+    def test_skip(self):
+        scheduler = self.scheduler(OverrunPolicy.SKIP)
+        scheduler.start()
+        self.clock.now += 0.035
+        scheduler.wait()
+
+        self.assertAlmostEqual(self.clock.now, 0.04)
+        self.assertEqual(scheduler.getOverruns(), 1)
+        self.assertEqual(scheduler.getStats()["skipped"], 3)
+
+    def test_bad_rate(self):
+        with self.assertRaises(ValueError):
+            LoopScheduler(0)
+
+    def test_wakeup(self):
+        scheduler = LoopScheduler(1)
+        scheduler.start()
+        threading.Timer(0.01, scheduler.wakeup).start()
+
+        begin = time.monotonic()
+        self.assertTrue(scheduler.wait())
+        self.assertLess(time.monotonic() - begin, 0.5)
+        self.assertEqual(scheduler.getStats()["wakeups"], 1)
+        self.assertEqual(scheduler.getStats()["wakeup"]["count"], 1)
+
+    def test_wakeup_keep_schedule(self):
+        wakes = [True, True, True]
+
+        def sleep(delay):
+            # Woken up after 1 ms, while wakes are pending.
+            if (wakes):
+                self.clock.now += 0.001
+                return wakes.pop()
+            self.clock.now += delay
+            return False
+
+        scheduler = LoopScheduler(100, clock=self.clock.time, sleep=sleep)
+        scheduler.start()
+        woken = [scheduler.wait() for _ in range(5)]
+
+        self.assertEqual(woken, [True, True, True, False, False])
+        # The scheduled ticks are still at 10 and 20 ms.
+        self.assertAlmostEqual(self.clock.now, 0.02)
+
+        # Woken ticks are out of the period and lateness series.
+        stats = scheduler.getStats()
+        self.assertEqual(stats["period"]["count"], 2)
+        self.assertAlmostEqual(stats["period"]["max"], 0.01)
+        self.assertEqual(stats["lateness"]["count"], 3)
+        self.assertAlmostEqual(stats["lateness"]["max"], 0)
+
+
+class RampBoard(object):
+
+    def __init__(self):
+        self.throttles = []
+
+    def setThrottleValue(self, value):
+        self.throttles.append(value)
+
+    def getRotationFromBegin(self):
+        return 100
+
+
+class StartingWinch(object):
+
+    def getClock(self):
+        return time.monotonic
+
+    def getState(self):
+        return State.START
+
+    def getSpeedTarget(self):
+        return 30
+
+    def started(self):
+        pass
+
+
+class ControlLoopWakeupTest(unittest.TestCase):
+
+    def ramp(self, notifies):
+        """ Throttles applied over 10 scheduled ticks, notify() called before each wait. """
+        board = RampBoard()
+        mode = OneWayMode(StartingWinch(), board)
+        scheduler = mode._scheduler
+        scheduler.start()
+        woken = False
+        scheduled = 0
+        while (scheduled < 10):
+            mode.tick(woken)
+            if (not woken):
+                scheduled += 1
+                for _ in range(notifies):
+                    mode.notify(State.START)
+            woken = scheduler.wait()
+        return board.throttles
+
+    def test_ramp_slope(self):
+        self.assertEqual(self.ramp(5), self.ramp(0))
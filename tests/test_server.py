@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import asyncio
+import http.client
+import json
+import threading
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.controller import Winch
+from openwinch.server import (AsyncSubscription, WebServer)
+
+
+class WebServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.winch = Winch(threaded=False)
+        cls.server = WebServer(cls.winch)
+        cls.loop = asyncio.new_event_loop()
+        started = asyncio.run_coroutine_threadsafe(cls.server.start("127.0.0.1", 0), cls.loop)
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        started.result(5)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(1)
+
+    def setUp(self):
+        self.connection = http.client.HTTPConnection("127.0.0.1", self.server.getPort(), timeout=5)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def request(self, method, path, body=None, headers={}):
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        return (response, response.read())
+
+    def test_pages_keep_alive(self):
+        response, body = self.request("GET", "/")
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"/api/v1/stream", body)
+        sock = self.connection.sock
+
+        speed = self.winch.getSpeedTarget()
+        response, body = self.request("GET", "/down")
+        self.assertIn(("%s" % (speed - 1)).encode(), body)
+        self.assertIs(self.connection.sock, sock)
+
+        self.assertEqual(self.request("GET", "/extra")[0].status, 200)
+        self.assertEqual(self.request("GET", "/static/style.css")[0].getheader("Content-Type"), "text/css")
+        self.assertEqual(self.request("GET", "/static/../server.py")[0].status, 404)
+        self.assertEqual(self.request("GET", "/missing")[0].status, 404)
+
+    def test_api(self):
+        response, body = self.request("GET", "/api/v1/state")
+        etag = response.getheader("ETag")
+        self.assertEqual(json.loads(body)["speed_target"], self.winch.getSpeedTarget())
+        self.assertEqual(self.request("GET", "/api/v1/state", headers={"If-None-Match": etag})[0].status, 304)
+
+        response, body = self.request("POST", "/api/v1/speed", json.dumps({"value": 15}), {"Content-Type": "application/json"})
+        self.assertEqual(json.loads(body)["speed_target"], 15)
+        self.assertEqual(self.request("POST", "/api/v1/speed", "value=99", {"Content-Type": "application/x-www-form-urlencoded"})[0].status, 400)
+        self.assertEqual(self.request("GET", "/api/v1/halt")[0].status, 405)
+
+    def test_gzip_quality(self):
+        self.assertEqual(self.request("GET", "/", headers={"Accept-Encoding": "gzip, br"})[0].getheader("Content-Encoding"), "gzip")
+        self.assertIsNone(self.request("GET", "/", headers={"Accept-Encoding": "gzip;q=0, br"})[0].getheader("Content-Encoding"))
+        self.assertIsNone(self.request("GET", "/", headers={"Accept-Encoding": "*;q=0"})[0].getheader("Content-Encoding"))
+
+    def test_slow_client(self):
+        broadcaster = self.server.getBroadcaster()
+        subscription = AsyncSubscription(broadcaster, self.loop)
+        for _ in range(broadcaster.getQueueSize() + 1):
+            self.assertTrue(subscription.put(b"data: {}\n\n"))
+
+        # Dropped by the event loop when its queue is full.
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self.loop).result(5)
+        self.assertTrue(subscription.closed)
+        self.assertFalse(subscription.put(b"data: {}\n\n"))
+
+    def test_stream(self):
+        self.connection.request("GET", "/api/v1/stream")
+        response = self.connection.getresponse()
+
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        self.assertEqual(response.readline(), b"id: 0\n")
+        self.assertTrue(response.readline().startswith(b"data: {"))
+
+
+if __name__ == '__main__':
+    unittest.main()
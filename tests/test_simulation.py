@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.mode import ModeType
+from openwinch.physics import DrumModel
+from openwinch.simulation import Simulation
+from openwinch.state import State
+from openwinch.constantes import WINCH_DISTANCE
+from openwinch.utils import (distance2rotate, rotate2distance)
+
+
+def tow(mode):
+    """ Init -> start -> run to security distance -> stop. """
+    sim = Simulation(mode)
+    sim.winch.initialize()
+    assert sim.runUntil(lambda winch: winch.getState() == State.IDLE, 1)
+    sim.runFor(30)  # Rope pulled out by the load.
+
+    sim.winch.start()
+    assert sim.runUntil(lambda winch: winch.getState() == State.RUNNING, 10)
+    return sim
+
+
+class SimulationTest(unittest.TestCase):
+
+    def test_oneway_tow(self):
+        sim = tow(ModeType.OneWay)
+
+        # Stop by itself at start security distance.
+        self.assertTrue(sim.runUntil(lambda winch: winch.getState() == State.IDLE, 60))
+        self.assertEqual(sim.winch.getSpeedCurrent(), 0)
+        self.assertGreater(sim.winch.getDistance(), 0)
+
+    def test_deterministic(self):
+        first = tow(ModeType.OneWay)
+        second = tow(ModeType.OneWay)
+
+        self.assertEqual(first.ticks, second.ticks)
+        self.assertEqual(first.winch.getDistance(), second.winch.getDistance())
+
+    def test_twoway_infinity(self):
+        for mode in (ModeType.TwoWay, ModeType.Infinity):
+            sim = tow(mode)
+            self.assertEqual(sim.winch.getState(), State.RUNNING)
+            sim.runFor(5)
+            sim.winch.stop()
+
+            self.assertTrue(sim.runUntil(lambda winch: winch.getState() == State.IDLE, 60))
+
+    def test_twoway_reverse(self):
+        sim = tow(ModeType.TwoWay)
+
+        # Rope wound in up to the begin security zone, then driven out.
+        self.assertTrue(sim.runUntil(lambda winch: winch.getDistance() <= rotate2distance(20), 60))
+        reversed_at = sim.winch.getDistance()
+        sim.runFor(10)
+
+        self.assertEqual(sim.winch.getState(), State.RUNNING)
+        self.assertGreater(sim.winch.getSpeedCurrent(), 0)
+        self.assertGreater(sim.winch.getDistance(), reversed_at)
+
+    def test_emergency(self):
+        sim = tow(ModeType.Infinity)
+        sim.winch.emergency()
+        sim.step()
+
+        self.assertEqual(sim.winch.getState(), State.ERROR)
+        self.assertEqual(sim.winch.getSpeedCurrent(), 0)
+
+
+class DrumModelTest(unittest.TestCase):
+
+    def steady(self, throttle):
+        model = DrumModel()
+        model.setPower(True)
+        model.setThrottle(throttle)
+        model.step(20)
+        return model.getRopeSpeed()
+
+    def test_throttle(self):
+        self.assertGreater(self.steady(1), self.steady(0.5))
+        self.assertGreater(self.steady(0.5), 0)
+
+    def test_pulled_out(self):
+        # Without power, the load pulls the rope out.
+        model = DrumModel()
+        model.step(10)
+
+        self.assertLess(model.getRopeSpeed(), 0)
+        self.assertGreater(model.getRotation(), 0)
+
+    def test_rope_end(self):
+        model = DrumModel()
+        model.step(200)
+        model.step(10)
+
+        self.assertEqual(model.getRopeSpeed(), 0)
+        self.assertEqual(model.getRotation(), distance2rotate(WINCH_DISTANCE))
+
+    def test_long_step(self):
+        # One long step is integrated with max_substeps, close to 1 ms steps.
+        fine = DrumModel()
+        fine.setPower(True)
+        fine.setThrottle(0.5)
+        for _ in range(20):
+            fine.step(1)
+
+        coarse = DrumModel()
+        coarse.setPower(True)
+        coarse.setThrottle(0.5)
+        coarse.step(20)
+
+        self.assertAlmostEqual(coarse.getRopeSpeed(), fine.getRopeSpeed(), places=2)
+        self.assertAlmostEqual(coarse.getRotation(), fine.getRotation(), delta=0.5)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import unittest
+from .context import openwinch  # noqa
+
+import importlib.util
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+class ParameterSweepTest(unittest.TestCase):
+
+    def test_default_profile(self):
+        from openwinch.sweep import ParameterSweep
+
+        result = ParameterSweep().run()
+
+        # 38 increments of 1 at 100 Hz.
+        self.assertAlmostEqual(result["time_to_target"][0], 0.37)
+        self.assertTrue(result["completed"][0])
+        self.assertFalse(result["breached"][0])
+
+    def test_grid(self):
+        from openwinch.sweep import ParameterSweep
+
+        sweep = ParameterSweep.grid(security_begin=[0.5, 20], velocity_stop=[0.1, 3], loop_delay=[0.01, 0.05])
+        result = sweep.run()
+
+        self.assertEqual(len(sweep), 8)
+        self.assertTrue(result["completed"].all())
+        # Slow stop ramp from a short security zone goes past the start point.
+        self.assertTrue(result["breached"][0])
+        self.assertFalse(result["breached"][-1])
+        self.assertTrue((result["stopping_distance"][[0, 1]] > result["stopping_distance"][[2, 3]]).all())
+
+    def test_same_duration(self):
+        from openwinch.sweep import ParameterSweep
+
+        # Too long to stop within max_time, whatever the loop period.
+        sweep = ParameterSweep(loop_delay=[0.01, 0.02, 0.05], start_distance=100000)
+        result = sweep.run(max_time=10)
+
+        self.assertFalse(result["completed"].any())
+        for elapsed in result["elapsed"]:
+            self.assertAlmostEqual(elapsed, 10)
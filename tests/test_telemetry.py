@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: UTF-8 -*-
+
+import json
+import threading
+import unittest
+from .context import openwinch  # noqa
+
+from openwinch.app import create_app
+from openwinch.controller import Winch
+from openwinch.pages import stateColor
+from openwinch.telemetry import Broadcaster
+
+
+def parse(event) -> dict:
+    data = [line for line in event.decode().splitlines() if line.startswith("data: ")]
+    return json.loads(data[0][len("data: "):])
+
+
+class FullSubscription(object):
+    """ Client dropped on its first event. """
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+
+    def put(self, event) -> bool:
+        self.broadcaster.unsubscribe(self)
+        return False
+
+
+class BroadcasterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.winch = Winch(threaded=False)
+
+    def test_delta(self):
+        broadcaster = Broadcaster(self.winch, rate=0.001)
+        events = broadcaster.subscribe().events(keepalive=0.01)
+
+        self.assertEqual(parse(next(events))["speed_target"], self.winch.getSpeedTarget())
+
+        self.winch.speedUp()
+        broadcaster.poll()
+        self.assertEqual(parse(next(events)), {"speed_target": self.winch.getSpeedTarget()})
+        self.assertEqual(next(events), b":\n\n")
+
+    def test_drop_slow_client(self):
+        broadcaster = Broadcaster(self.winch, rate=0.001, size=2)
+        fast = broadcaster.subscribe()
+        slow = broadcaster.subscribe()
+        events = fast.events(keepalive=0.01)
+
+        for _ in range(2):
+            self.winch.speedDown()
+            broadcaster.poll()
+            next(events)
+
+        self.assertTrue(slow.closed)
+        self.assertFalse(fast.closed)
+        self.assertEqual(broadcaster.getStats()["clients"], 1)
+        self.assertEqual(broadcaster.getStats()["dropped"], 1)
+
+    def test_subscribe_full(self):
+        broadcaster = Broadcaster(self.winch, rate=0.001)
+        thread = threading.Thread(target=broadcaster.subscribe, args=(FullSubscription(broadcaster),), daemon=True)
+        thread.start()
+        thread.join(2)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(broadcaster.getStats()["clients"], 0)
+
+    def test_endpoint(self):
+        app = create_app(self.winch)
+        response = app.test_client().get("/api/v1/stream", buffered=False)
+
+        self.assertEqual(response.mimetype, "text/event-stream")
+        document = parse(next(response.response))
+        self.assertEqual(document["state"], self.winch.getState().name)
+        self.assertEqual(document["color"], stateColor(self.winch.getState()))
+        response.close()
+        self.assertEqual(app.extensions['openwinch.stream'].getStats()["clients"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()